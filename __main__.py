@@ -0,0 +1,9 @@
+# 저장소 폴더째로 실행할 때의 진입점: python openai_project translate ... 또는 python -m openai_project ...
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
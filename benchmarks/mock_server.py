@@ -0,0 +1,355 @@
+# 벤치마크용 로컬 OpenAI 대역 서버.
+# 이 앱이 쓰는 API만 흉내 낸다: chat.completions(스트리밍 포함), responses, images,
+# audio.transcriptions, files, vector_stores. 지연/지터/오류율/429 비율을 설정할 수 있다.
+#
+#   python -m benchmarks.mock_server --port 8089 --latency 0.2 --jitter 0.1 --rate-limit-rate 0.05
+import argparse
+import base64
+import itertools
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockConfig:
+    def __init__(self, latency=0.05, jitter=0.02, error_rate=0.0, rate_limit_rate=0.0,
+                 token_delay=0.005, reply_words=40, indexing_delay=0.3, retry_after_ms=200):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.token_delay = token_delay
+        self.reply_words = reply_words
+        self.indexing_delay = indexing_delay
+        self.retry_after_ms = retry_after_ms
+
+
+def _tiny_png():
+    # 1x1 흰색 PNG
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xff\xff\xff")
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+PNG_BYTES = _tiny_png()
+
+
+class MockState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.vector_stores = {}
+        self.vector_store_files = {}
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+    def new_id(self, prefix):
+        return f"{prefix}_{next(self.ids)}"
+
+
+def make_handler(config, state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        # --- 공통 ---
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if self.headers.get("Content-Type", "").startswith("application/json") and raw:
+                return json.loads(raw)
+            return {"_raw": raw}
+
+        def _send_json(self, status, payload, headers=None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_text(self, text):
+            data = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _start_sse(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+        def _sse(self, payload, event=None):
+            text = ""
+            if event:
+                text += f"event: {event}\n"
+            text += "data: " + (payload if isinstance(payload, str) else json.dumps(payload)) + "\n\n"
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def _end_sse(self):
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def _simulate(self):
+            # 지연을 흉내 내고, 설정된 비율로 429/500을 돌려준다. 응답을 보냈으면 True
+            with state.lock:
+                state.requests += 1
+            time.sleep(max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)))
+            roll = random.random()
+            if roll < config.rate_limit_rate:
+                with state.lock:
+                    state.rate_limited += 1
+                self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                {"retry-after-ms": str(config.retry_after_ms)})
+                return True
+            if roll < config.rate_limit_rate + config.error_rate:
+                with state.lock:
+                    state.errors += 1
+                self._send_json(500, {"error": {"message": "Mock server error", "type": "server_error"}})
+                return True
+            return False
+
+        def _reply_words(self):
+            return [f"단어{i}" for i in range(config.reply_words)]
+
+        # --- 라우팅 ---
+        def do_POST(self):
+            body = self._body()
+            if self._simulate():
+                return
+            path = self.path.split("?")[0]
+            if path.endswith("/chat/completions"):
+                return self._chat(body)
+            if path.endswith("/responses"):
+                return self._responses(body)
+            if path.endswith("/images/generations"):
+                return self._images(body)
+            if path.endswith("/audio/transcriptions"):
+                return self._send_text(" ".join(self._reply_words()))
+            if path.endswith("/files") and "/vector_stores/" not in path:
+                return self._send_json(200, {
+                    "id": state.new_id("file"), "object": "file", "bytes": len(body.get("_raw", b"")),
+                    "created_at": int(time.time()), "filename": "upload", "purpose": "assistants",
+                    "status": "processed"
+                })
+            if path.endswith("/vector_stores"):
+                return self._create_vector_store(body)
+            if "/vector_stores/" in path and path.endswith("/files"):
+                store_id = path.split("/vector_stores/")[1].split("/")[0]
+                return self._add_vector_store_file(store_id, body)
+            self._send_json(404, {"error": {"message": f"Unknown path {path}"}})
+
+        def do_GET(self):
+            if self._simulate():
+                return
+            path = self.path.split("?")[0]
+            if path.endswith("/image.png"):
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(PNG_BYTES)))
+                self.end_headers()
+                self.wfile.write(PNG_BYTES)
+                return
+            parts = path.split("/vector_stores")
+            if len(parts) == 2:
+                rest = [p for p in parts[1].split("/") if p]
+                if not rest:
+                    with state.lock:
+                        stores = list(state.vector_stores.values())
+                    return self._send_json(200, {"object": "list", "data": stores, "has_more": False})
+                if len(rest) == 1:
+                    store = state.vector_stores.get(rest[0])
+                    if store is None:
+                        return self._send_json(404, {"error": {"message": "not found"}})
+                    return self._send_json(200, store)
+                if len(rest) == 3 and rest[1] == "files":
+                    return self._vector_store_file(rest[0], rest[2])
+            self._send_json(404, {"error": {"message": f"Unknown path {path}"}})
+
+        def do_DELETE(self):
+            if self._simulate():
+                return
+            store_id = self.path.split("/vector_stores/")[-1].split("?")[0]
+            with state.lock:
+                state.vector_stores.pop(store_id, None)
+            self._send_json(200, {"id": store_id, "object": "vector_store.deleted", "deleted": True})
+
+        # --- 엔드포인트 ---
+        def _chat(self, body):
+            model = body.get("model", "mock")
+            words = self._reply_words()
+            usage = {"prompt_tokens": 20, "completion_tokens": len(words), "total_tokens": 20 + len(words)}
+            created = int(time.time())
+            if not body.get("stream"):
+                return self._send_json(200, {
+                    "id": state.new_id("chatcmpl"), "object": "chat.completion", "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": " ".join(words)}}],
+                    "usage": usage
+                })
+
+            chunk_id = state.new_id("chatcmpl")
+
+            def chunk(delta, finish=None, with_usage=None):
+                payload = {"id": chunk_id, "object": "chat.completion.chunk", "created": created,
+                           "model": model, "choices": []}
+                if delta is not None:
+                    payload["choices"] = [{"index": 0, "delta": delta, "finish_reason": finish}]
+                if with_usage:
+                    payload["usage"] = with_usage
+                return payload
+
+            self._start_sse()
+            self._sse(chunk({"role": "assistant", "content": ""}))
+            for i, word in enumerate(words):
+                time.sleep(config.token_delay)
+                self._sse(chunk({"content": word if i == 0 else " " + word}))
+            self._sse(chunk({}, finish="stop"))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._sse(chunk(None, with_usage=usage))
+            self._sse("[DONE]")
+            self._end_sse()
+
+        def _response_object(self, model, text, status="completed"):
+            return {
+                "id": state.new_id("resp"), "object": "response", "created_at": int(time.time()),
+                "model": model, "status": status, "parallel_tool_calls": True, "tool_choice": "auto",
+                "tools": [],
+                "output": [{
+                    "type": "message", "id": state.new_id("msg"), "role": "assistant", "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}]
+                }] if text else [],
+                "usage": {"input_tokens": 20, "output_tokens": config.reply_words,
+                          "total_tokens": 20 + config.reply_words,
+                          "input_tokens_details": {"cached_tokens": 0},
+                          "output_tokens_details": {"reasoning_tokens": 0}}
+            }
+
+        def _responses(self, body):
+            model = body.get("model", "mock")
+            words = self._reply_words()
+            if not body.get("stream"):
+                return self._send_json(200, self._response_object(model, " ".join(words)))
+
+            self._start_sse()
+            sequence = itertools.count()
+            created = self._response_object(model, "", status="in_progress")
+            self._sse({"type": "response.created", "response": created,
+                       "sequence_number": next(sequence)}, event="response.created")
+            for i, word in enumerate(words):
+                time.sleep(config.token_delay)
+                self._sse({"type": "response.output_text.delta", "item_id": "msg", "output_index": 0,
+                           "content_index": 0, "delta": word if i == 0 else " " + word,
+                           "sequence_number": next(sequence)}, event="response.output_text.delta")
+            self._sse({"type": "response.completed",
+                       "response": self._response_object(model, " ".join(words)),
+                       "sequence_number": next(sequence)}, event="response.completed")
+            self._end_sse()
+
+        def _images(self, body):
+            item = {"revised_prompt": body.get("prompt")}
+            if body.get("response_format") == "url":
+                host = self.headers.get("Host")
+                item["url"] = f"http://{host}/image.png"
+            else:
+                item["b64_json"] = base64.b64encode(PNG_BYTES).decode("ascii")
+            self._send_json(200, {"created": int(time.time()), "data": [item]})
+
+        def _create_vector_store(self, body):
+            store = {
+                "id": state.new_id("vs"), "object": "vector_store", "created_at": int(time.time()),
+                "name": body.get("name"), "status": "completed", "usage_bytes": 0,
+                "file_counts": {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": 0},
+                "last_active_at": int(time.time()), "metadata": {}
+            }
+            with state.lock:
+                state.vector_stores[store["id"]] = store
+            self._send_json(200, store)
+
+        def _add_vector_store_file(self, store_id, body):
+            file_id = body.get("file_id")
+            with state.lock:
+                state.vector_store_files[(store_id, file_id)] = time.monotonic()
+            self._send_json(200, self._vector_store_file_object(store_id, file_id, "in_progress"))
+
+        def _vector_store_file(self, store_id, file_id):
+            with state.lock:
+                added = state.vector_store_files.get((store_id, file_id))
+            if added is None:
+                return self._send_json(404, {"error": {"message": "not found"}})
+            done = time.monotonic() - added >= config.indexing_delay
+            status = "completed" if done else "in_progress"
+            self._send_json(200, self._vector_store_file_object(store_id, file_id, status))
+
+        def _vector_store_file_object(self, store_id, file_id, status):
+            return {"id": file_id, "object": "vector_store.file", "created_at": int(time.time()),
+                    "vector_store_id": store_id, "status": status, "usage_bytes": 0, "last_error": None}
+
+    return Handler
+
+
+class MockOpenAIServer:
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.state = MockState()
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.config, self.state))
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    config = MockConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, token_delay=args.token_delay)
+    server = MockOpenAIServer(config, args.host, args.port)
+    print(f"mock OpenAI server: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
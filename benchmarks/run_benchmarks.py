@@ -0,0 +1,187 @@
+# 로컬 대역 서버를 띄워 놓고 각 워커를 GUI 없이 동시 실행 수를 늘려 가며 돌린다.
+# 네트워크나 API 키 없이 워커/스레딩 코드의 처리량과 지연 시간 백분위를 비교할 수 있다.
+#
+#   python -m benchmarks.run_benchmarks
+#   python -m benchmarks.run_benchmarks --features translate rudebot --concurrency 1 4 16 \
+#       --strategy executor qthreadpool --latency 0.3 --rate-limit-rate 0.05 --json results.json
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.mock_server import MockConfig, MockOpenAIServer
+
+FEATURES = ("translate", "poem", "rudebot", "image", "audio", "filesearch")
+STRATEGIES = ("executor", "qthreadpool")
+SAMPLE_AUDIO = os.path.join(ROOT, "pages", "tts", "test1.mp3")
+SAMPLE_DOCUMENT = os.path.join(ROOT, "pages", "filesearch", "book.doc")
+
+
+def prepare_environment(server, workdir):
+    # 캐시는 끄고 임시 폴더를 쓰며, 클라이언트가 대역 서버를 바라보게 한다
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ.setdefault("API_KEY", "mock-key")
+    os.environ["APP_DATA_DIR"] = workdir
+    os.environ["METRICS_EXPORT_PATH"] = os.path.join(workdir, "metrics.jsonl")
+    os.environ["RESPONSE_CACHE_DISABLED"] = "translate,poem,rudebot,batch_translate,transcribe"
+    os.environ.setdefault("RATE_LIMITS", ",".join(
+        f"{model}=100000:100000000" for model in
+        ("gpt-4", "gpt-4.1", "gpt-3.5-turbo", "dall-e-3", "whisper-1")
+    ))
+
+
+def make_worker(feature, client, index, workdir):
+    if feature == "translate":
+        from workers.translate_worker import TranslateWorker
+        return TranslateWorker(client, f"Benchmark paragraph number {index}.")
+    if feature == "poem":
+        from workers.poem_worker import PoemWorker
+        return PoemWorker(client, f"벤치마크 {index}")
+    if feature == "rudebot":
+        from workers.rudebot_worker import RudebotWorker
+        return RudebotWorker(client, f"질문 {index}")
+    if feature == "image":
+        from workers.image_worker import ImageWorker
+        return ImageWorker(client, f"benchmark image {index}", use_cache=False)
+    if feature == "audio":
+        from workers.audio_worker import AudioWorker
+        output = os.path.join(workdir, f"notes_{index}.docx")
+        return AudioWorker(client, SAMPLE_AUDIO, output, chunked=False)
+    if feature == "filesearch":
+        from workers.file_worker import FileWorker
+        return FileWorker(client, SAMPLE_DOCUMENT, f"질문 {index}")
+    raise ValueError(feature)
+
+
+def run_executor(feature, client, jobs, concurrency, workdir):
+    # 워커의 run()을 파이썬 스레드 풀에서 직접 호출한다 (Qt 이벤트 루프 없음).
+    # 지연 시간은 qthreadpool과 같게 제출 시점부터 재므로 큐 대기 시간이 포함된다
+    submitted = time.perf_counter()
+
+    def run_one(index):
+        worker = make_worker(feature, client, index, workdir)
+        errors = []
+        worker.error.connect(errors.append)
+        worker.run()
+        return time.perf_counter() - submitted, bool(errors)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(run_one, range(jobs)))
+
+
+def run_qthreadpool(feature, client, jobs, concurrency, workdir):
+    # 앱과 같은 경로: WorkerPool(QThreadPool)에 제출하고 이벤트 루프로 완료 시그널을 받는다
+    from PyQt5.QtCore import QCoreApplication, QEventLoop
+    from workers.pool import WorkerPool
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    pool = WorkerPool(max_threads=concurrency)
+    loop = QEventLoop()
+    results = []
+    lock = threading.Lock()
+
+    def submit(index):
+        worker = make_worker(feature, client, index, workdir)
+        state = {"error": False}
+        started = time.perf_counter()
+
+        def on_error(*_):
+            state["error"] = True
+
+        def on_done():
+            with lock:
+                results.append((time.perf_counter() - started, state["error"]))
+                if len(results) == jobs:
+                    loop.quit()
+
+        worker.error.connect(on_error)
+        worker.done.connect(on_done)
+        pool.submit(worker)
+
+    for index in range(jobs):
+        submit(index)
+    if len(results) < jobs:
+        loop.exec_()
+    pool.wait_for_done()
+    return results
+
+
+def summarize(results, wall):
+    from services.metrics import percentile
+
+    latencies = [latency for latency, _ in results]
+    return {
+        "jobs": len(results),
+        "errors": sum(1 for _, failed in results if failed),
+        "wall": wall,
+        "throughput": len(results) / wall if wall else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 처리량/지연 시간 벤치마크")
+    parser.add_argument("--features", nargs="+", default=list(FEATURES), choices=FEATURES)
+    parser.add_argument("--strategy", nargs="+", default=["executor"], choices=STRATEGIES)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--jobs", type=int, default=32, help="동시 실행 수준마다 실행할 작업 수")
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.03)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    config = MockConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, token_delay=args.token_delay,
+                        indexing_delay=args.latency * 3)
+    server = MockOpenAIServer(config).start()
+    workdir = tempfile.mkdtemp(prefix="openai_project_bench_")
+    prepare_environment(server, workdir)
+
+    if "qthreadpool" in args.strategy:
+        # Qt는 처음 QObject를 만든 스레드를 메인 스레드로 보므로 실행 전에 앱 객체를 만든다
+        from PyQt5.QtCore import QCoreApplication
+        app = QCoreApplication(sys.argv[:1])
+
+    from services.transport import get_client
+    client = get_client()
+
+    runners = {"executor": run_executor, "qthreadpool": run_qthreadpool}
+    rows = []
+    print(f"{'feature':<11} {'strategy':<12} {'conc':>4} {'jobs':>5} {'err':>4} "
+          f"{'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7}")
+    try:
+        for feature in args.features:
+            for strategy in args.strategy:
+                for concurrency in args.concurrency:
+                    started = time.perf_counter()
+                    results = runners[strategy](feature, client, args.jobs, concurrency, workdir)
+                    row = summarize(results, time.perf_counter() - started)
+                    row.update(feature=feature, strategy=strategy, concurrency=concurrency)
+                    rows.append(row)
+                    print(f"{feature:<11} {strategy:<12} {concurrency:>4} {row['jobs']:>5} {row['errors']:>4} "
+                          f"{row['throughput']:>8.2f} {row['p50']:>7.3f} {row['p95']:>7.3f} {row['p99']:>7.3f}")
+    finally:
+        server.stop()
+
+    print(f"mock server: {server.state.requests} requests, "
+          f"{server.state.rate_limited} x 429, {server.state.errors} x 500")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
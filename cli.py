@@ -0,0 +1,261 @@
+# GUI 없이 각 기능을 실행하는 명령줄 진입점 (PyQt5를 가져오지 않는다).
+# 입력은 인자/파일/글롭/표준 입력에서 받고, 결과는 한 줄에 하나씩 JSONL로 쓴다.
+#
+#   python cli.py translate notes/*.txt -o out.jsonl
+#   echo "가을 바다" | python cli.py poem
+#   python cli.py rudebot questions.txt --jobs 8
+#   python cli.py image "white cute cat" --out-dir images
+#   python cli.py audio-notes "recordings/*.mp3" --out-dir notes
+#   python cli.py audio-notes meeting.mp3 --out-dir notes --section action_items
+#   python cli.py filesearch book.doc -q "주인공은 누구인가?" --local
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_JOBS = 4
+# services.audio_notes.ANALYSES의 항목 이름 (인자를 해석할 때 서비스 모듈을 불러오지 않도록 따로 둔다)
+NOTE_SECTIONS = ("abstract_summary", "key_points", "action_items", "sentiment")
+
+
+# --- 입력 ---
+
+def read_texts(values, split_lines):
+    # 값마다 글롭/파일이면 파일 내용을, 아니면 그 자체를 입력으로 쓴다. 값이 없거나 "-"면 표준 입력
+    items = []
+    for value in values or ["-"]:
+        if value == "-":
+            items.extend(_split("<stdin>", sys.stdin.read(), split_lines))
+            continue
+        paths = sorted(glob.glob(value))
+        if not paths:
+            items.append((value, value))
+            continue
+        for path in paths:
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    items.extend(_split(path, f.read(), split_lines))
+    return items
+
+
+def read_paths(values):
+    # 파일 경로 목록: 글롭을 펼치고, 값이 없거나 "-"면 표준 입력에서 한 줄에 하나씩 읽는다
+    paths = []
+    for value in values or ["-"]:
+        if value == "-":
+            paths.extend(line.strip() for line in sys.stdin if line.strip())
+            continue
+        matches = sorted(glob.glob(value))
+        if not matches:
+            raise SystemExit(f"파일을 찾을 수 없습니다: {value}")
+        paths.extend(matches)
+    return paths
+
+
+def _split(source, text, split_lines):
+    if not split_lines:
+        return [(source, text)] if text.strip() else []
+    return [
+        (f"{source}:{number}", line.strip())
+        for number, line in enumerate(text.splitlines(), 1)
+        if line.strip()
+    ]
+
+
+# --- 기능별 작업 ---
+# 각 함수는 (client, args, item)을 받아 결과 레코드에 합칠 dict를 돌려준다
+
+def run_translate(client, args, text):
+    from services.translation import translate_text
+    return {"output": translate_text(client, text)}
+
+
+def run_poem(client, args, topic):
+    from pages.poem.first_ChatGPT_API import generate_poem_text
+    return {"output": generate_poem_text(client, topic)}
+
+
+def run_rudebot(client, args, question):
+    from services.rudebot import ask_rudebot
+    return {"output": ask_rudebot(client, question, stream=False)}
+
+
+def run_image(client, args, prompt):
+    from services.image_gen import generate_image
+    data = generate_image(client, prompt, use_cache=not args.no_cache)
+    name = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16] + ".png"
+    path = os.path.join(args.out_dir, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return {"output": path}
+
+
+def run_audio_notes(client, args, audio_path):
+    from services.audio_notes import load_notes, meeting_notes, save_notes
+    name = os.path.splitext(os.path.basename(audio_path))[0] + ".docx"
+    path = os.path.join(args.out_dir, name)
+    # --section이면 그 항목만 다시 만들고 나머지는 이미 있는 회의록에서 가져온다
+    previous = load_notes(path) if args.sections and os.path.exists(path) else None
+    notes = meeting_notes(client, audio_path, chunked=args.chunked, sections=args.sections, previous=previous)
+    return {"output": save_notes(notes, path), "notes": notes}
+
+
+def run_filesearch(client, args, item):
+    path, question = item
+    if args.local:
+        from services.local_search import ask_local
+        notes = ask_local(client, path, question)
+    else:
+        from services.file_search import FileSearch
+        notes = FileSearch(client, path, vector_store_id=args.vector_store_id).ask(question)
+    return {"output": notes.pop("answer"), "notes": notes}
+
+
+# --- 실행 ---
+
+def execute(command, client, args, items, out):
+    # 작업들을 스레드 풀에서 동시에 돌리고, 끝나는 순서대로 한 줄씩 쓴다 (index로 원래 순서 복원)
+    failures = 0
+
+    def run_one(index, source, item):
+        started = time.perf_counter()
+        record = {"index": index, "command": command.name, "source": source, "input": item}
+        try:
+            record.update(command.run(client, args, item))
+            record["error"] = None
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["elapsed"] = round(time.perf_counter() - started, 3)
+        return record
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = [
+            executor.submit(run_one, index, source, item)
+            for index, (source, item) in enumerate(items)
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            if record["error"]:
+                failures += 1
+                print(f"[{record['index']}] {record['source']}: {record['error']}", file=sys.stderr)
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+    return failures
+
+
+class Command:
+    def __init__(self, name, run, help):
+        self.name = name
+        self.run = run
+        self.help = help
+
+
+COMMANDS = [
+    Command("translate", run_translate, "영어 텍스트를 한국어로 번역"),
+    Command("poem", run_poem, "주제별로 시 생성"),
+    Command("rudebot", run_rudebot, "RudeBot에게 질문"),
+    Command("image", run_image, "프롬프트로 이미지 생성"),
+    Command("audio-notes", run_audio_notes, "음성 파일을 전사하고 회의록 작성"),
+    Command("filesearch", run_filesearch, "문서에 대해 질문"),
+]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="openai_project 명령줄 실행기")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command in COMMANDS:
+        sub = subparsers.add_parser(command.name, help=command.help)
+        sub.set_defaults(command_spec=command)
+        sub.add_argument("inputs", nargs="*", help="텍스트, 파일, 글롭 또는 - (표준 입력)")
+        sub.add_argument("-o", "--output", help="JSONL 출력 파일 (기본: 표준 출력)")
+        sub.add_argument("-j", "--jobs", type=int,
+                         default=int(os.getenv("WORKER_MAX_THREADS", DEFAULT_JOBS)),
+                         help="동시에 실행할 작업 수")
+
+        if command.name in ("translate", "poem", "rudebot", "image"):
+            # 번역은 파일 하나가 입력 하나, 나머지는 한 줄이 입력 하나
+            sub.add_argument("--lines", dest="split_lines", action="store_true",
+                             default=command.name != "translate", help="한 줄을 입력 하나로 취급")
+            sub.add_argument("--whole", dest="split_lines", action="store_false",
+                             help="파일/표준 입력 전체를 입력 하나로 취급")
+        if command.name in ("image", "audio-notes"):
+            sub.add_argument("--out-dir", default=".", help="생성된 파일을 저장할 폴더")
+        if command.name == "image":
+            sub.add_argument("--no-cache", action="store_true", help="이미지 캐시를 쓰지 않음")
+        if command.name == "audio-notes":
+            sub.add_argument("--chunked", action="store_true", default=None, help="항상 분할 전사")
+            sub.add_argument("--no-chunked", dest="chunked", action="store_false", help="분할 전사 안 함")
+            sub.add_argument("--section", dest="sections", action="append", choices=NOTE_SECTIONS,
+                             help="이 항목만 다시 만듦 (여러 번 지정 가능, 나머지는 기존 회의록 사용)")
+        if command.name == "filesearch":
+            sub.add_argument("-q", "--question", action="append", required=True,
+                             help="질문 (여러 번 지정 가능)")
+            sub.add_argument("--local", action="store_true", help="로컬 색인으로 검색")
+    return parser
+
+
+def collect_items(args):
+    name = args.command_spec.name
+    if name == "audio-notes":
+        return [(path, path) for path in read_paths(args.inputs)]
+    if name == "filesearch":
+        return [
+            (f"{path}#{number}", (path, question))
+            for path in read_paths(args.inputs)
+            for number, question in enumerate(args.question, 1)
+        ]
+    return read_texts(args.inputs, args.split_lines)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    items = collect_items(args)
+    if not items:
+        print("입력이 없습니다.", file=sys.stderr)
+        return 2
+
+    try:
+        import dotenv
+        dotenv.load_dotenv()
+    except ImportError:
+        pass
+
+    if args.command_spec.name == "filesearch" and args.local:
+        # 로컬 검색은 API 키 없이도 돌아야 하므로 클라이언트는 답변을 만들 때 처음 만든다
+        from services.lazy_client import LazyClient
+        client = LazyClient()
+    else:
+        from services.transport import get_client
+        client = get_client()
+
+    if getattr(args, "out_dir", None):
+        os.makedirs(args.out_dir, exist_ok=True)
+    if args.command_spec.name == "filesearch" and not args.local:
+        # 동시 실행 중에 벡터 스토어가 여러 개 만들어지지 않도록 먼저 하나를 정해 둔다
+        from services.vector_store import get_vector_store_id
+        args.vector_store_id = get_vector_store_id(client)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        failures = execute(args.command_spec, client, args, items, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if failures:
+        print(f"{len(items)}개 중 {failures}개 실패", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
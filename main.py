@@ -1,27 +1,44 @@
-import os
+import time
+_STARTED = time.perf_counter()
+
+import importlib
+import json
+import sys
 import dotenv
-import requests
-from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog
-from PyQt5.QtCore import QThread
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication, QMainWindow
 from ui.main_window import Ui_MainWindow
-from openai import OpenAI
 dotenv.load_dotenv()
 
-# 각 기능 페이지들 임포트
-from pages.filesearch.file import FilesearchPage
-from pages.poem.first_ChatGPT_API import generate_poem_text
-from pages.translate.translation import TranslatePage
-from pages.image.image_sys import ImagePage
-from pages.rudebot.rudebot import RudebotPage
-from pages.tts.audio import AudioPage
-
-## 워커 임포트해서 가져오기
-from workers.image_worker import ImageWorker
-from workers.audio_worker import AudioWorker
-from workers.rudebot_worker import RudebotWorker
-from workers.file_worker import FileWorker
-from workers.translate_worker import TranslateWorker
+from services.lazy_client import LazyClient
+
+# stackedWidget 순서대로 (모듈, 클래스, 클라이언트 필요 여부).
+# 페이지와 워커 모듈은 메뉴에서 처음 선택될 때 임포트하고 만든다
+PAGES = [
+    ("pages.poem.poem", "PoemPage", True),
+    ("pages.image.image_sys", "ImagePage", True),
+    ("pages.translate.translation", "TranslatePage", True),
+    ("pages.tts.audio", "AudioPage", True),
+    ("pages.filesearch.file", "FilesearchPage", True),
+    ("pages.rudebot.rudebot", "RudebotPage", True),
+    ("pages.metrics.metrics", "MetricsPage", False),
+]
+STARTUP_FLAG = "--measure-startup"
+# 클라이언트 준비를 기다리는 최대 시간(초, 측정 모드에서만)
+CLIENT_WAIT_TIMEOUT = 30
+# 종료할 때 취소된 워커 스레드가 빠지기를 기다리는 최대 시간(ms)
+SHUTDOWN_WAIT_MSECS = 3000
+
+
+def shutdown():
+    # 진행 중인 작업을 모두 취소하고(요청 연결은 끊긴다) 스레드가 빠질 때까지 잠깐 기다린다.
+    # 대화 요약 모듈은 이미 불러온 경우에만 정리한다 (종료하면서 새로 임포트하지 않도록)
+    from workers.pool import WorkerPool
+    WorkerPool.instance().shutdown(SHUTDOWN_WAIT_MSECS)
+    conversation = sys.modules.get("services.conversation")
+    if conversation is not None:
+        conversation.shutdown()
+
 
 # --- Main Window ---
 class MainWindow(QMainWindow):
@@ -29,41 +46,75 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
-        self.client = OpenAI(api_key=os.getenv("API_KEY"))
-
-        self.translate_page = TranslatePage(self.ui, self.client)
-        self.image_page = ImagePage(self.ui, self.client)
-        self.filesearch_page = FilesearchPage(self.ui, self.client)
-        self.rude_page = RudebotPage(self.ui, self.client)
-        self.audio_page = AudioPage(self.ui, self.client)
-
+        # openai 임포트와 클라이언트 생성은 창을 띄우는 동안 백그라운드에서 한다
+        self.client = LazyClient().preload()
+        self.pages = {}
 
         # 메뉴 전환
-        self.ui.menu_list.currentRowChanged.connect(self.ui.stackedWidget.setCurrentIndex)
-        self.ui.poem_generate_btn.clicked.connect(self.generate_poem)
+        self.ui.menu_list.currentRowChanged.connect(self.show_page)
         self.show()
+        # 처음 보이는 페이지는 첫 화면을 그린 뒤에 만든다
+        QTimer.singleShot(0, lambda: self.ensure_page(self.ui.stackedWidget.currentIndex()))
+
+    def show_page(self, index):
+        self.ensure_page(index)
+        self.ui.stackedWidget.setCurrentIndex(index)
+
+    def ensure_page(self, index):
+        if index < 0 or index >= len(PAGES):
+            return None
+        if index not in self.pages:
+            module_name, class_name, needs_client = PAGES[index]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            if needs_client:
+                self.pages[index] = page_class(self.ui, self.client)
+            else:
+                self.pages[index] = page_class(self.ui)
+        return self.pages[index]
+
+
+class StartupTimer(QObject):
+    # --measure-startup: 임포트/창 생성/첫 화면/클라이언트 준비까지 걸린 시간을 재고
+    # 앱 데이터 폴더의 startup.jsonl에 한 줄씩 남긴 뒤 종료한다
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.marks = {"imports": time.perf_counter() - _STARTED}
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - _STARTED
+
+    def watch(self, window):
+        self.window = window
+        window.installEventFilter(self)
 
-    # --- 시 생성 ---
-    def generate_poem(self):
-        topic = self.ui.poem_topic_input.text()
-        if not topic:
-            self.ui.poem_result_view.setText("시의 주제를 입력해주세요.")
-            return
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_paint" not in self.marks:
+            self.mark("first_paint")
+            QTimer.singleShot(0, self.finish)
+        return False
 
-        self.ui.poem_generate_btn.setEnabled(False)
-        self.ui.poem_result_view.setText("시를 생성 중입니다...")
+    def finish(self):
+        self.window.client.ready.wait(CLIENT_WAIT_TIMEOUT)
+        self.mark("client_ready")
+        record = {"timestamp": time.time()}
+        record.update({f"{name}_ms": round(value * 1000, 1) for name, value in self.marks.items()})
 
-        try:
-            result_text = generate_poem_text(self.client, topic)
-            self.ui.poem_result_view.setText(result_text)
-        except Exception as e:
-            self.ui.poem_result_view.setText(f"오류 발생: {e}")
-        finally:
-            self.ui.poem_generate_btn.setEnabled(True)
+        from services.paths import data_path
+        with open(data_path("startup.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(" ".join(f"{name}={value * 1000:.0f}ms" for name, value in self.marks.items()),
+              file=sys.stderr)
+        self.app.quit()
 
 
 if __name__ == "__main__":
-    import sys
-    app = QApplication(sys.argv)
+    measure = STARTUP_FLAG in sys.argv
+    app = QApplication([arg for arg in sys.argv if arg != STARTUP_FLAG])
+    app.aboutToQuit.connect(shutdown)
+    timer = StartupTimer(app) if measure else None
     window = MainWindow()
-    sys.exit(app.exec())
\ No newline at end of file
+    if timer is not None:
+        timer.mark("window")
+        timer.watch(window)
+    sys.exit(app.exec())
@@ -1,17 +1,17 @@
-from PyQt5.QtCore import QThread
-from workers.file_worker import FileWorker
+from workers.pool import WorkerPool
 
 
 class FilesearchPage:
     def __init__(self, ui, client):
         self.ui = ui
         self.client = client
-        self.vector_store_id = self.client.vector_stores.create(name="file_search_store").id
+        # 벡터 스토어는 첫 검색 때 워커 스레드에서 준비한다 (services/vector_store.py)
+        self.vector_store_id = None
 
-        self.thread = None 
         self.worker = None
 
         self.ui.file_btn.clicked.connect(self.start_file_search)
+        self.ui.file_cancel_btn.clicked.connect(self.cancel)
 
     def start_file_search(self):
         file_path = self.ui.file_input.text()
@@ -21,39 +21,51 @@ class FilesearchPage:
             self.ui.translate_result_view_2.setText("파일과 질문을 입력하세요.")
             return
 
-        if self.thread is not None and self.thread.isRunning():
+        if self.worker is not None:
             self.ui.translate_result_view_2.setText("이미 파일 분석 중입니다. 잠시만 기다려주세요.")
             return
 
         self.ui.translate_result_view_2.setText("파일 분석 중입니다...")
 
-        self.thread = QThread()
-        self.worker = FileWorker(self.client, file_path, question, self.vector_store_id)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-
+        # 로컬 검색을 선택하면 업로드/벡터스토어 없이 내 PC에서 색인하고 검색한다
+        if self.ui.file_local_checkbox.isChecked():
+            from workers.local_search_worker import LocalSearchWorker
+            self.worker = LocalSearchWorker(self.client, file_path, question)
+        else:
+            from workers.file_worker import FileWorker
+            self.worker = FileWorker(self.client, file_path, question, self.vector_store_id)
+        self.worker.progress.connect(self.handle_progress)
         self.worker.finished.connect(self.handle_finished)
         self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
 
-        self.worker.finished.connect(self._cleanup_thread)
-        self.worker.error.connect(self._cleanup_thread)
-
-        self.thread.start()
+        self.ui.file_cancel_btn.setEnabled(True)
+        WorkerPool.instance().submit(self.worker)
 
-    def _cleanup_thread(self, *args):
-        if self.thread is not None:
-            self.thread.quit()
-            self.thread.wait()
-            self.thread = None
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.file_cancel_btn.setEnabled(False)
+        self.ui.translate_result_view_2.setText("취소하는 중입니다...")
+        WorkerPool.instance().cancel(self.worker)
 
+    def _cleanup_worker(self):
         self.worker = None
+        self.ui.file_cancel_btn.setEnabled(False)
+
+    def handle_progress(self, message):
+        self.ui.translate_result_view_2.setText(message)
 
     def handle_finished(self, result, answer):
+        self.vector_store_id = result.get("vector_store_id", self.vector_store_id)
         try:
             self.ui.translate_result_view_2.setText(result.get("file_answer", answer))
         except Exception as e:
             print("UI update error:", e)
 
     def handle_error(self, e):
-        self.ui.translate_result_view_2.setText(f"오류 발생: {e}")
\ No newline at end of file
+        self.ui.translate_result_view_2.setText(f"오류 발생: {e}")
+
+    def handle_cancelled(self):
+        self.ui.translate_result_view_2.setText("파일 분석을 취소했습니다.")
\ No newline at end of file
@@ -1,65 +1,129 @@
-from PyQt5.QtCore import QThread
-from workers.image_worker import ImageWorker
-import requests
-from PyQt5.QtGui import QPixmap
+from workers.pool import WorkerPool
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QListWidgetItem
+
+# 미리보기 픽스맵은 QPixmapCache(LRU)에 이 용량까지만 두고, 밀려난 것은 디스크 캐시에서 다시 읽는다
+PIXMAP_CACHE_MB = 64
+# 갤러리에 남겨둘 최대 썸네일 수 (넘으면 오래된 것부터 뺀다)
+MAX_GALLERY_ITEMS = 500
+# 한 칸에 "고양이 | 강아지"처럼 여러 프롬프트를 넣을 수 있다
+PROMPT_SEPARATOR = "|"
 
 class ImagePage:
     def __init__(self, ui, client):
         self.ui = ui
         self.client = client
-        self.thread = None
         self.worker = None
+        self.preview_worker = None
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_MB * 1024)
 
         self.ui.image_generate_btn.clicked.connect(self.generate_image)
+        self.ui.image_cancel_btn.clicked.connect(self.cancel)
+        self.ui.image_gallery.currentItemChanged.connect(self.show_selected)
 
     def generate_image(self):
-        prompt = self.ui.image_prompt_input.text()
-        if not prompt:
+        prompts = [p.strip() for p in self.ui.image_prompt_input.text().split(PROMPT_SEPARATOR) if p.strip()]
+        if not prompts:
             self.ui.image_display_label.setText("이미지 프롬프트를 입력하세요.")
             return
 
-        if self.thread is not None and self.thread.isRunning():
+        if self.worker is not None:
             self.ui.image_display_label.setText("이미지 생성 중입니다. 잠시만 기다려주세요.")
             return
 
+        variants = self.ui.image_count_spin.value()
+        self._total = len(prompts) * variants
+        self._completed = 0
         self.ui.image_generate_btn.setEnabled(False)
-        self.ui.image_display_label.setText("이미지 생성 중...")
-
-
-        self.thread = QThread()
-        self.worker = ImageWorker(self.client, prompt)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-
-        self.worker.finished.connect(self.handle_result)
+        self.ui.image_cancel_btn.setEnabled(True)
+        self.ui.image_display_label.setText(f"이미지 생성 중... (0/{self._total})")
+
+        from workers.image_worker import ImageBatchWorker
+        self.worker = ImageBatchWorker(self.client, prompts, variants)
+        self.worker.item_ready.connect(self.handle_item)
+        self.worker.item_failed.connect(self.handle_item_error)
+        self.worker.finished.connect(self.handle_finished)
         self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
 
-        self.worker.finished.connect(self._cleanup_thread)
-        self.worker.error.connect(self._cleanup_thread)
+        WorkerPool.instance().submit(self.worker)
 
-        self.thread.start()
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.image_cancel_btn.setEnabled(False)
+        WorkerPool.instance().cancel(self.worker)
+
+    def handle_item(self, index, prompt, key, thumbnail, preview):
+        self._completed += 1
+        pixmap = QPixmap.fromImage(preview)
+        QPixmapCache.insert(key, pixmap)
+
+        item = QListWidgetItem(QIcon(QPixmap.fromImage(thumbnail)), "")
+        item.setData(Qt.UserRole, key)
+        item.setToolTip(prompt)
+        self.ui.image_gallery.addItem(item)
+        while self.ui.image_gallery.count() > MAX_GALLERY_ITEMS:
+            self.ui.image_gallery.takeItem(0)
+
+        # 끝나는 대로 바로 보여준다
+        self.ui.image_gallery.blockSignals(True)
+        self.ui.image_gallery.setCurrentItem(item)
+        self.ui.image_gallery.scrollToItem(item)
+        self.ui.image_gallery.blockSignals(False)
+        self.ui.image_display_label.setPixmap(pixmap)
+
+    def handle_item_error(self, index, prompt, message):
+        self._completed += 1
+        self.ui.image_display_label.setText(f"'{prompt}' 생성 실패 ({self._completed}/{self._total}): {message}")
+
+    def handle_finished(self, succeeded, failed):
+        if failed and not succeeded:
+            self.ui.image_display_label.setText(f"이미지를 만들지 못했습니다. ({failed}장 실패)")
+
+    def handle_cancelled(self):
+        # 이미 만들어진 이미지는 갤러리와 캐시에 그대로 남는다
+        self.ui.image_display_label.setText(f"이미지 생성을 취소했습니다. ({self._completed}/{self._total} 완료)")
+
+    def show_selected(self, item, previous=None):
+        if item is None:
+            return
+        key = item.data(Qt.UserRole)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            self.ui.image_display_label.setPixmap(pixmap)
+            return
 
-    def handle_result(self, url):
-        try:
-            img_data = requests.get(url).content
-            pixmap = QPixmap()
-            pixmap.loadFromData(img_data)
+        if self.preview_worker is not None:
+            return
+        from workers.image_worker import ImagePreviewWorker
+        self.preview_worker = ImagePreviewWorker(key)
+        self.preview_worker.finished.connect(self.handle_preview)
+        self.preview_worker.error.connect(self.handle_error)
+        self.preview_worker.done.connect(self._cleanup_preview_worker)
+        WorkerPool.instance().submit(self.preview_worker)
+
+    def handle_preview(self, key, image):
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        current = self.ui.image_gallery.currentItem()
+        if current is not None and current.data(Qt.UserRole) == key:
             self.ui.image_display_label.setPixmap(pixmap)
-        except Exception as e:
-            self.ui.image_display_label.setText(f"이미지 로딩 오류: {e}")
 
     def handle_error(self, e):
         self.ui.image_display_label.setText(f"오류 발생: {e}")
 
-    def _cleanup_thread(self, *args):
-        if self.thread is not None and self.thread.isRunning():
-            self.thread.quit()
-            self.thread.wait()
-
-        if self.worker is not None:
-            self.worker.deleteLater()
-            self.worker = None
-
-        self.thread = None
-        self.ui.image_generate_btn.setEnabled(True)
\ No newline at end of file
+    def _cleanup_worker(self):
+        self.worker = None
+        self.ui.image_generate_btn.setEnabled(True)
+        self.ui.image_cancel_btn.setEnabled(False)
+
+    def _cleanup_preview_worker(self):
+        loaded_key = self.preview_worker.key
+        self.preview_worker = None
+        # 불러오는 사이에 다른 썸네일을 골랐으면 이어서 그 이미지를 보여준다
+        current = self.ui.image_gallery.currentItem()
+        if current is not None and current.data(Qt.UserRole) != loaded_key:
+            self.show_selected(current)
@@ -0,0 +1,65 @@
+from PyQt5.QtCore import QTimer
+from services.metrics import MetricsRecorder
+
+REFRESH_INTERVAL_MS = 2000
+
+COLUMNS = [
+    ("count", "호출"),
+    ("errors", "오류"),
+    ("retries", "재시도"),
+    ("latency_p50", "p50"),
+    ("latency_p95", "p95"),
+    ("latency_p99", "p99"),
+    ("ttft_p50", "첫 토큰 p50"),
+    ("queue_wait_p95", "대기 p95"),
+    ("prompt_tokens", "입력 토큰"),
+    ("completion_tokens", "출력 토큰"),
+]
+
+
+class MetricsPage:
+    def __init__(self, ui):
+        self.ui = ui
+
+        # 지표 페이지가 보이는 동안만 주기적으로 갱신한다
+        self.timer = QTimer()
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self._refresh_if_visible)
+        self.timer.start()
+
+        self.ui.metrics_refresh_btn.clicked.connect(self.refresh)
+
+    def refresh(self):
+        recorder = MetricsRecorder.instance()
+        summary = recorder.summary()
+        if not summary:
+            self.ui.metrics_view.setText("아직 기록된 API 호출이 없습니다.")
+            return
+
+        header = "".join(f"<th>{title}</th>" for _, title in COLUMNS)
+        rows = []
+        for feature, stats in summary.items():
+            cells = "".join(f"<td align='right'>{self._format(stats[key])}</td>" for key, _ in COLUMNS)
+            rows.append(f"<tr><td>{feature}</td>{cells}</tr>")
+
+        from services.response_cache import ResponseCache
+        cache = ResponseCache.instance().stats()
+        self.ui.metrics_view.setHtml(
+            f"<table border='1' cellspacing='0' cellpadding='4'><tr><th>기능</th>{header}</tr>"
+            + "".join(rows)
+            + "</table>"
+            + f"<p>응답 캐시: 메모리 {cache['memory_hits']} / 디스크 {cache['disk_hits']} 적중, "
+              f"{cache['misses']} 미스 (적중률 {cache['hit_rate']:.0%})</p>"
+            + f"<p>전체 기록: {recorder.export_path}</p>"
+        )
+
+    def _refresh_if_visible(self):
+        if self.ui.stackedWidget.currentWidget() is self.ui.page_7:
+            self.refresh()
+
+    def _format(self, value):
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
@@ -1,14 +1,13 @@
 # pages/poem/poem.py
+from services.response_cache import cached_chat_text
 
-def generate_poem_text(client, topic):
-  completion = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system",
-             "content": "You are a helpful assistant who writes poems in Korean."},
-            {"role": "user",
-             "content": f"{topic}에 대한 시를 작성해줘."}
-        ]
-    )
+def generate_poem_text(client, topic, on_delta=None):
+  messages = [
+      {"role": "system",
+       "content": "You are a helpful assistant who writes poems in Korean."},
+      {"role": "user",
+       "content": f"{topic}에 대한 시를 작성해줘."}
+  ]
 
-  return completion.choices[0].message.content
\ No newline at end of file
+  # on_delta가 주어지면 스트리밍으로 조각을 바로 넘겨준다 (캐시 적중 시에는 한 번에)
+  return cached_chat_text(client, "poem", on_delta, model="gpt-3.5-turbo", messages=messages)
@@ -0,0 +1,69 @@
+from PyQt5.QtGui import QTextCursor
+from workers.pool import WorkerPool
+
+
+class PoemPage:
+    def __init__(self, ui, client):
+        self.ui = ui
+        self.client = client
+        self.worker = None
+
+        self.ui.poem_generate_btn.clicked.connect(self.generate_poem)
+        self.ui.poem_cancel_btn.clicked.connect(self.cancel)
+
+    def generate_poem(self):
+        topic = self.ui.poem_topic_input.text()
+        if not topic:
+            self.ui.poem_result_view.setText("시의 주제를 입력해주세요.")
+            return
+
+        if self.worker is not None:
+            self.ui.poem_result_view.setText("시를 생성 중입니다. 잠시만 기다려주세요.")
+            return
+
+        self.ui.poem_generate_btn.setEnabled(False)
+        self.ui.poem_cancel_btn.setEnabled(True)
+        self.ui.poem_result_view.setText("시를 생성 중입니다...")
+        self._received_partial = False
+
+        from workers.poem_worker import PoemWorker
+        self.worker = PoemWorker(self.client, topic)
+        self.worker.partial.connect(self.handle_partial)
+        self.worker.finished.connect(self.handle_result)
+        self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
+
+        WorkerPool.instance().submit(self.worker)
+
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.poem_cancel_btn.setEnabled(False)
+        WorkerPool.instance().cancel(self.worker)
+
+    def handle_partial(self, delta):
+        if not self._received_partial:
+            self._received_partial = True
+            self.ui.poem_result_view.clear()
+        self.ui.poem_result_view.moveCursor(QTextCursor.End)
+        self.ui.poem_result_view.insertPlainText(delta)
+
+    def handle_result(self, text):
+        self.ui.poem_result_view.setText(text)
+
+    def handle_error(self, e):
+        self.ui.poem_result_view.setText(f"오류 발생: {e}")
+
+    def handle_cancelled(self):
+        # 받은 만큼은 남겨 두고 취소됐다고 덧붙인다
+        if self._received_partial:
+            self.ui.poem_result_view.moveCursor(QTextCursor.End)
+            self.ui.poem_result_view.insertPlainText("\n\n(취소됨)")
+        else:
+            self.ui.poem_result_view.setText("시 생성을 취소했습니다.")
+
+    def _cleanup_worker(self):
+        self.worker = None
+        self.ui.poem_generate_btn.setEnabled(True)
+        self.ui.poem_cancel_btn.setEnabled(False)
@@ -1,40 +1,112 @@
-from openai import OpenAI
+# RudeBot 파인튜닝: 데이터 검증/정리 -> 업로드 -> 작업 생성 -> 완료까지 진행 상황 추적
+#
+#   python pages/rudebot/finetuning.py                      # data10.jsonl로 학습
+#   python pages/rudebot/finetuning.py big.jsonl --dry-run  # 검증/비용 추정만
+#   python pages/rudebot/finetuning.py big.jsonl --shard-examples 50000 --validation-split 0.05
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
 from dotenv import load_dotenv
-import os, traceback
+
+from services import finetune
+from services.paths import data_dir
 
 env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path=env_path)
 
-client = OpenAI(api_key=os.environ.get("API_KEY"))
-training_file_path = os.path.join(os.path.dirname(__file__), "data10.jsonl")
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), "data10.jsonl")
 
-if not os.path.exists(training_file_path):
-    raise FileNotFoundError(f"학습 데이터 파일이 없습니다: {training_file_path}")
 
-try:
-    print("학습 데이터 업로드 중...")
-    train_file = client.files.create(
-        file=open(training_file_path, "rb"),
-        purpose="fine-tune"
+def print_report(report):
+    print(f"읽은 예제: {report['total_lines']}개, 사용: {report['kept']}개 "
+          f"(train {report['train_examples']} / validation {report['validation_examples']})")
+    for reason, count in sorted(report["rejected"].items(), key=lambda item: -item[1]):
+        print(f"  제외 - {reason}: {count}개")
+    for line_number, reason in report["rejected_samples"]:
+        print(f"    {line_number}번째 줄: {reason}")
+    print(f"토큰: 합계 {report['tokens_total']}, 최소 {report['tokens_min']}, "
+          f"최대 {report['tokens_max']}, 평균 {report['tokens_mean']:.1f}")
+    cost = report["estimated_cost"]
+    cost_text = f"${cost:.2f}" if cost is not None else "가격 정보 없음"
+    print(f"에폭: {report['epochs']}, 과금 토큰: {report['billed_tokens']}, 예상 비용: {cost_text}")
+    for path in report["train_files"] + report["validation_files"]:
+        print(f"  -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RudeBot 파인튜닝 데이터 준비 및 학습")
+    parser.add_argument("data", nargs="?", default=DEFAULT_DATA)
+    parser.add_argument("--model", default=finetune.FINETUNE_MODEL)
+    parser.add_argument("--out-dir", default=os.path.join(data_dir(), "finetune"))
+    parser.add_argument("--validation-split", type=float, default=0.1)
+    parser.add_argument("--shard-examples", type=int, help="조각 파일 하나에 넣을 최대 예제 수")
+    parser.add_argument("--max-tokens", type=int, default=finetune.MAX_EXAMPLE_TOKENS)
+    parser.add_argument("--epochs", type=int, help="지정하지 않으면 예제 수로 추정")
+    parser.add_argument("--suffix", help="결과 모델 이름에 붙일 접미사")
+    parser.add_argument("--dry-run", action="store_true", help="검증과 비용 추정만 하고 업로드하지 않음")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.data):
+        raise FileNotFoundError(f"학습 데이터 파일이 없습니다: {args.data}")
+
+    print("학습 데이터 검증 중...")
+    report = finetune.prepare_dataset(
+        args.data,
+        args.out_dir,
+        model=args.model,
+        validation_fraction=args.validation_split,
+        shard_examples=args.shard_examples,
+        max_tokens=args.max_tokens,
+        epochs=args.epochs
     )
-    print(f"파일 업로드 완료: {train_file.id}")
-
-except Exception as e:
-    print(" 파일 업로드 중 오류 발생:")
-    traceback.print_exc()
-    exit()
-
-try:
-    print(" 새로운 Fine-tuning 작업 시작...")
-    fine_tune = client.fine_tuning.jobs.create(
-        model="gpt-3.5-turbo-0125", 
-        training_file=train_file.id
+    print_report(report)
+
+    if report["train_examples"] < finetune.MIN_TRAINING_EXAMPLES:
+        print(f"학습 예제가 {finetune.MIN_TRAINING_EXAMPLES}개보다 적어 작업을 만들 수 없습니다.")
+        return 1
+    if args.dry_run:
+        return 0
+
+    from services.transport import get_client
+    client = get_client()
+
+    print("학습 데이터 업로드 중...")
+    train_ids = finetune.upload_files(client, report["train_files"])
+    validation_id = None
+    if report["validation_files"]:
+        validation_id = finetune.upload_file(client, report["validation_files"][0])
+    print(f"파일 업로드 완료: {', '.join(train_ids)}")
+
+    started = time.monotonic()
+    last_status = {}
+
+    def on_poll(job):
+        # 상태가 바뀌거나 학습 토큰이 늘었을 때만 출력한다
+        state = (job.status, getattr(job, "trained_tokens", None))
+        if last_status.get(job.id) != state:
+            last_status[job.id] = state
+            elapsed = time.monotonic() - started
+            print(f"[{elapsed:6.0f}초] {job.id}: {job.status}")
+
+    # 조각마다 API가 에폭 수를 따로 정하면 위에서 보여준 과금 추정과 달라지므로 추정값으로 고정한다
+    job = finetune.run_jobs(
+        client,
+        train_ids,
+        validation_file=validation_id,
+        model=args.model,
+        epochs=report["epochs"],
+        suffix=args.suffix,
+        on_poll=on_poll
     )
+    print(f"튜닝 완료! 모델: {job.fine_tuned_model}")
+    return 0
 
-    print(f"🚀 튜닝 작업 생성 완료! Job ID: {fine_tune.id}")
-    print("👉 아래 명령으로 상태를 추적하세요:")
-    print(f"   openai api fine_tuning.jobs.get -i {fine_tune.id}")
 
-except Exception as e:
-    print("튜닝 작업 생성 중 오류 발생:")
-    traceback.print_exc()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
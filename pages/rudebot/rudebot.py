@@ -1,12 +1,18 @@
-from PyQt5.QtCore import QThread
-from workers.rudebot_worker import RudebotWorker
+from PyQt5.QtGui import QTextCursor
+import uuid
+from workers.pool import WorkerPool
 
 class RudebotPage:
     def __init__(self, ui, client):
         self.ui = ui
         self.client = client
+        self.worker = None
+        # 세션이 같으면 이전 대화를 기억한다. "새 대화"를 누르면 새 세션을 시작한다
+        self.session_id = uuid.uuid4().hex
 
         self.ui.rudebot_btn_2.clicked.connect(self.ask_rudebot)
+        self.ui.rudebot_new_btn.clicked.connect(self.new_conversation)
+        self.ui.rudebot_cancel_btn.clicked.connect(self.cancel)
 
     def ask_rudebot(self):
         question = self.ui.rudebot_input_2.text().strip()
@@ -14,27 +20,63 @@ class RudebotPage:
             self.ui.translate_result_view_3.setText(" 질문을 입력하세요!")
             return
 
+        if self.worker is not None:
+            return
+
         self.ui.rudebot_btn_2.setEnabled(False)
+        self.ui.rudebot_new_btn.setEnabled(False)
+        self.ui.rudebot_cancel_btn.setEnabled(True)
         self.ui.translate_result_view_3.setText("🤖 RudeBot 생각 중...")
+        self._received_partial = False
 
-        self.thread = QThread()
-        self.worker = RudebotWorker(self.client, question)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
+        from workers.rudebot_worker import RudebotWorker
+        self.worker = RudebotWorker(self.client, question, session_id=self.session_id)
+        self.worker.partial.connect(self.handle_partial)
         self.worker.finished.connect(self.handle_result)
         self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
 
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+        WorkerPool.instance().submit(self.worker)
 
-        self.thread.start()
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.rudebot_cancel_btn.setEnabled(False)
+        WorkerPool.instance().cancel(self.worker)
+
+    def new_conversation(self):
+        if self.worker is not None:
+            return
+        from services.conversation import SessionStore
+        SessionStore.instance().drop(self.session_id)
+        self.session_id = uuid.uuid4().hex
+        self.ui.rudebot_input_2.clear()
+        self.ui.translate_result_view_3.setText("새 대화를 시작합니다.")
+
+    def handle_partial(self, delta):
+        if not self._received_partial:
+            self._received_partial = True
+            self.ui.translate_result_view_3.clear()
+        self.ui.translate_result_view_3.moveCursor(QTextCursor.End)
+        self.ui.translate_result_view_3.insertPlainText(delta)
 
     def handle_result(self, text):
         self.ui.translate_result_view_3.setText(text)
-        self.ui.rudebot_btn_2.setEnabled(True)
 
     def handle_error(self, msg):
         self.ui.translate_result_view_3.setText(f"⚠️ 오류 발생: {msg}")
-        self.ui.rudebot_btn_2.setEnabled(True)
\ No newline at end of file
+
+    def handle_cancelled(self):
+        # 취소된 질문은 대화 기록에 남지 않는다
+        if self._received_partial:
+            self.ui.translate_result_view_3.moveCursor(QTextCursor.End)
+            self.ui.translate_result_view_3.insertPlainText("\n\n(취소됨)")
+        else:
+            self.ui.translate_result_view_3.setText("질문을 취소했습니다.")
+
+    def _cleanup_worker(self):
+        self.worker = None
+        self.ui.rudebot_btn_2.setEnabled(True)
+        self.ui.rudebot_new_btn.setEnabled(True)
+        self.ui.rudebot_cancel_btn.setEnabled(False)
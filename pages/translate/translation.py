@@ -1,15 +1,21 @@
 # pages/translate/translate_page.py
-from PyQt5.QtCore import QThread
-from workers.translate_worker import TranslateWorker
+import os
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QFileDialog
+from workers.pool import WorkerPool
 
 
 class TranslatePage:
     def __init__(self, ui, client):
         self.ui = ui
         self.client = client
+        self.worker = None
 
         # 버튼 클릭 연결
         self.ui.translate_btn.clicked.connect(self.translate_text)
+        self.ui.translate_file_btn.clicked.connect(self.translate_file)
+        self.ui.translate_folder_btn.clicked.connect(self.translate_folder)
+        self.ui.translate_cancel_btn.clicked.connect(self.cancel)
 
     def translate_text(self):
         source_text = self.ui.translate_source_input.toPlainText()
@@ -17,28 +23,100 @@ class TranslatePage:
             self.ui.translate_result_view.setText("번역할 문장을 입력하세요.")
             return
 
-        self.ui.translate_btn.setEnabled(False)
+        # 이전 번역이 끝나기 전에는 새 작업을 만들지 않는다
+        if self.worker is not None:
+            return
+
+        self._set_buttons_enabled(False)
         self.ui.translate_result_view.setText("번역 중입니다...")
+        self._received_partial = False
 
-        # 스레드 생성
-        self.thread = QThread()
+        from workers.translate_worker import TranslateWorker
         self.worker = TranslateWorker(self.client, source_text)
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
+        self.worker.partial.connect(self.handle_partial)
         self.worker.finished.connect(self.handle_result)
         self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
+
+        WorkerPool.instance().submit(self.worker)
+
+    def translate_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            None,
+            "번역할 파일",
+            "",
+            "Documents (*.txt *.docx *.jsonl)"
+        )
+        if path:
+            self._start_batch(path)
+
+    def translate_folder(self):
+        path = QFileDialog.getExistingDirectory(None, "번역할 폴더")
+        if path:
+            self._start_batch(path)
+
+    def _start_batch(self, path):
+        if self.worker is not None:
+            return
+
+        self._set_buttons_enabled(False)
+        self.ui.translate_result_view.setText(f"일괄 번역 준비 중입니다: {path}")
+        self._received_partial = False
+
+        from workers.translate_worker import BatchTranslateWorker
+        self.worker = BatchTranslateWorker(self.client, path)
+        self.worker.progress.connect(self.handle_batch_progress)
+        self.worker.finished.connect(self.handle_batch_result)
+        self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.worker.done.connect(self._cleanup_worker)
 
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+        WorkerPool.instance().submit(self.worker)
 
-        self.thread.start()
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.translate_cancel_btn.setEnabled(False)
+        WorkerPool.instance().cancel(self.worker)
+
+    def handle_partial(self, delta):
+        # 첫 조각이 오면 안내 문구를 지우고 이후 조각은 뒤에 이어 붙인다
+        if not self._received_partial:
+            self._received_partial = True
+            self.ui.translate_result_view.clear()
+        self.ui.translate_result_view.moveCursor(QTextCursor.End)
+        self.ui.translate_result_view.insertPlainText(delta)
 
     def handle_result(self, text):
         self.ui.translate_result_view.setText(text)
-        self.ui.translate_btn.setEnabled(True)
+
+    def handle_batch_progress(self, done, total, path):
+        self.ui.translate_result_view.setText(
+            f"일괄 번역 중입니다... {os.path.basename(path)}: {done}/{total}"
+        )
+
+    def handle_batch_result(self, outputs):
+        self.ui.translate_result_view.setText("일괄 번역 완료:\n" + "\n".join(outputs))
 
     def handle_error(self, e):
         self.ui.translate_result_view.setText(f"오류 발생: {e}")
-        self.ui.translate_btn.setEnabled(True)
\ No newline at end of file
+
+    def handle_cancelled(self):
+        # 일괄 번역은 끝난 구간이 체크포인트에 남아 있어서 다시 실행하면 이어서 번역한다
+        if self._received_partial:
+            self.ui.translate_result_view.moveCursor(QTextCursor.End)
+            self.ui.translate_result_view.insertPlainText("\n\n(취소됨)")
+        else:
+            self.ui.translate_result_view.append("번역을 취소했습니다.")
+
+    def _set_buttons_enabled(self, enabled):
+        self.ui.translate_btn.setEnabled(enabled)
+        self.ui.translate_file_btn.setEnabled(enabled)
+        self.ui.translate_folder_btn.setEnabled(enabled)
+        # 작업 중에만 취소할 수 있다
+        self.ui.translate_cancel_btn.setEnabled(not enabled)
+
+    def _cleanup_worker(self):
+        self.worker = None
+        self._set_buttons_enabled(True)
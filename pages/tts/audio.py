@@ -1,6 +1,5 @@
-from PyQt5.QtCore import QThread
 from PyQt5.QtWidgets import QFileDialog
-from workers.audio_worker import AudioWorker
+from workers.pool import WorkerPool
 import traceback
 
 
@@ -8,10 +7,10 @@ class AudioPage:
     def __init__(self, ui, client):
         self.ui = ui
         self.client = client
-        self.thread = None
         self.worker = None
 
         self.ui.audio_note_btn.clicked.connect(self.generate_audio_note)
+        self.ui.audio_cancel_btn.clicked.connect(self.cancel)
 
     def generate_audio_note(self):
         try:
@@ -20,9 +19,15 @@ class AudioPage:
                 self.ui.audio_status_label.setText("오디오 파일 경로를 입력하세요.")
                 return
 
+            if self.worker is not None:
+                self.ui.audio_status_label.setText("이미 노트를 생성 중입니다. 잠시만 기다려주세요.")
+                return
+
+            # 한 항목만 다시 만들 때는 이전에 저장한 회의록을 골라서 그 항목만 바꿔 쓴다
+            section_index = self.ui.audio_section_combo.currentIndex()
             output_file, _ = QFileDialog.getSaveFileName(
                 None,
-                "저장할 파일",
+                "저장할 파일" if section_index == 0 else "다시 만들 회의록 파일",
                 "",
                 "Word Document (*.docx)"
             )
@@ -36,19 +41,18 @@ class AudioPage:
             if label is not None:
                 label.setText("노트 생성 중...")
             self.ui.audio_note_btn.setEnabled(False)
+            self.ui.audio_cancel_btn.setEnabled(True)
 
-            self.thread = QThread()
-            self.worker = AudioWorker(self.client, path, output_file)
-            self.worker.moveToThread(self.thread)
-
-            self.thread.started.connect(self.worker.run)
+            from services.audio_notes import ANALYSES
+            from workers.audio_worker import AudioWorker
+            sections = None if section_index == 0 else [ANALYSES[section_index - 1][0]]
+            self.worker = AudioWorker(self.client, path, output_file, sections=sections)
             self.worker.finished.connect(self.handle_audio_result)
             self.worker.error.connect(self.handle_audio_error)
+            self.worker.cancelled.connect(self.handle_audio_cancelled)
+            self.worker.done.connect(self._cleanup_worker)
 
-            self.worker.finished.connect(self._cleanup_thread)
-            self.worker.error.connect(self._cleanup_thread)
-
-            self.thread.start()
+            WorkerPool.instance().submit(self.worker)
 
         except Exception as e:
             traceback.print_exc()
@@ -57,6 +61,13 @@ class AudioPage:
                 label.setText(f"오류 발생: {e}")
             self.ui.audio_note_btn.setEnabled(True)
 
+    def cancel(self):
+        if self.worker is None:
+            return
+        self.ui.audio_cancel_btn.setEnabled(False)
+        self.ui.audio_status_label.setText("취소하는 중입니다...")
+        WorkerPool.instance().cancel(self.worker)
+
     def handle_audio_result(self, notes, filename):
         try:
             label = getattr(self.ui, "audio_status_label", None)
@@ -73,22 +84,10 @@ class AudioPage:
         except Exception as e:
             traceback.print_exc()
 
-    def _cleanup_thread(self, *args):
-        try:
-            if self.thread:
-                if self.thread.isRunning():
-                    self.thread.quit()
-                    self.thread.wait()
-                self.thread = None
-
-            if self.worker:
-                try:
-                    self.worker.deleteLater()
-                except Exception:
-                    pass
-                self.worker = None
+    def handle_audio_cancelled(self):
+        self.ui.audio_status_label.setText("노트 생성을 취소했습니다.")
 
-            self.ui.audio_note_btn.setEnabled(True)
-        except Exception as e:
-            traceback.print_exc()
-            self.ui.audio_note_btn.setEnabled(True)
\ No newline at end of file
+    def _cleanup_worker(self):
+        self.worker = None
+        self.ui.audio_note_btn.setEnabled(True)
+        self.ui.audio_cancel_btn.setEnabled(False)
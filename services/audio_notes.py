@@ -0,0 +1,200 @@
+# 음성 파일 -> 전사 -> 회의록(요약/핵심/할 일/감정) 파이프라인 (Qt 없이 사용 가능)
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cancel import bind
+from services.response_cache import cached_chat_text
+from services.tokens import count_tokens
+from services.transcription import transcribe_file
+from services.transport import call
+
+NOTES_MODEL = "gpt-4"
+# 회의록 항목과 지시문. 순서대로 문서에 적힌다
+ANALYSES = (
+    ("abstract_summary", "Summarize the following text:"),
+    ("key_points", "Extract key points:"),
+    ("action_items", "Extract action items:"),
+    ("sentiment", "Analyze the sentiment:"),
+)
+
+# 전사본이 이보다 길면 조각으로 나눠 요약(map)한 뒤 조각 요약들을 다시 합친다(reduce).
+# gpt-4(8k) 문맥에 지시문과 답변 자리를 남기도록 잡는다
+CHUNK_TOKENS = 3000
+MAP_MAX_TOKENS = 600
+MAX_PARALLEL = 4
+MAP_INSTRUCTION = (
+    "This is part {index} of {total} of a meeting transcript. Write concise notes for this part only, "
+    "under four headings: Summary, Key points, Action items (with owners if mentioned), Sentiment. "
+    "Write in the language of the transcript."
+)
+MERGE_INSTRUCTION = (
+    "Merge these notes from consecutive parts of one meeting into a single set of notes under the same "
+    "four headings. Keep every action item. Write in the language of the notes."
+)
+REDUCE_CONTEXT = "The text below is notes taken from consecutive parts of a long meeting."
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def meeting_notes(client, audio_path, chunked=None, sections=None, previous=None):
+    # chunked가 None이면 파일 크기가 업로드 제한을 넘을 때만 분할 전사한다.
+    # 전사본은 캐시되므로 sections만 다시 만들 때는 전사도 map 단계도 다시 요청하지 않는다
+    transcription = transcribe_file(client, audio_path, chunked=chunked)
+    return analyze(client, transcription, sections, previous)
+
+
+def analyze(client, text, sections=None, previous=None):
+    # sections에 든 항목(없으면 전부)만 새로 만들고 나머지는 previous(이전 회의록)에서 가져온다.
+    # previous에 없는 항목은 sections와 상관없이 만든다
+    previous = previous or {}
+    tasks = [
+        (key, instruction) for key, instruction in ANALYSES
+        if sections is None or key in sections or key not in previous
+    ]
+    if tasks and count_tokens(text, NOTES_MODEL) > CHUNK_TOKENS:
+        text = f"{REDUCE_CONTEXT}\n\n{map_transcript(client, text)}"
+
+    # 분석끼리는 서로 독립적이므로 동시에 요청하고, 결과는 원래 순서대로 담는다
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1) as executor:
+        futures = {
+            key: executor.submit(bind(ask_gpt), client, instruction, text)
+            for key, instruction in tasks
+        }
+        return {
+            key: futures[key].result() if key in futures else previous[key]
+            for key, _ in ANALYSES
+        }
+
+
+def map_transcript(client, text):
+    # 조각마다 네 항목을 한 번에 메모하고, 메모를 합쳐도 길면 다시 묶어서 줄인다
+    chunks = split_transcript(text, CHUNK_TOKENS)
+    total = len(chunks)
+    notes = _parallel(
+        lambda item: _cached_notes(client, MAP_INSTRUCTION.format(index=item[0] + 1, total=total), item[1]),
+        list(enumerate(chunks))
+    )
+    while len(notes) > 1 and count_tokens("\n\n".join(notes), NOTES_MODEL) > CHUNK_TOKENS:
+        groups = _group(notes, CHUNK_TOKENS)
+        if len(groups) == len(notes):
+            break
+        notes = _parallel(lambda group: _merge_notes(client, group), groups)
+    return "\n\n---\n\n".join(notes)
+
+
+def split_transcript(text, max_tokens=CHUNK_TOKENS):
+    # 문장 경계에서 자르고, 한 문장이 너무 길면 글자 수로 자른다
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence in _SENTENCE_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        tokens = count_tokens(sentence, NOTES_MODEL)
+        if tokens > max_tokens:
+            step = max(1, len(sentence) * max_tokens // tokens)
+            pieces = [sentence[i:i + step] for i in range(0, len(sentence), step)]
+        else:
+            pieces = [sentence]
+        for piece in pieces:
+            piece_tokens = tokens if len(pieces) == 1 else count_tokens(piece, NOTES_MODEL)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def ask_gpt(client, instruction, text):
+    response = call(
+        "chat",
+        client.chat.completions.create,
+        feature="audio",
+        model=NOTES_MODEL,
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": f"{instruction}\n\n{text}"}
+        ]
+    )
+    return response.choices[0].message.content
+
+
+def _cached_notes(client, instruction, text):
+    # 조각 내용이 캐시 키가 되므로 같은 전사본의 map 단계는 다시 요청하지 않는다
+    return cached_chat_text(
+        client,
+        "audio_map",
+        model=NOTES_MODEL,
+        max_tokens=MAP_MAX_TOKENS,
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant who takes meeting notes."},
+            {"role": "user", "content": f"{instruction}\n\n{text}"}
+        ]
+    )
+
+
+def _merge_notes(client, group):
+    if len(group) == 1:
+        return group[0]
+    return _cached_notes(client, MERGE_INSTRUCTION, "\n\n---\n\n".join(group))
+
+
+def _group(notes, max_tokens):
+    groups = [[]]
+    used = 0
+    for note in notes:
+        tokens = count_tokens(note, NOTES_MODEL)
+        if groups[-1] and used + tokens > max_tokens:
+            groups.append([])
+            used = 0
+        groups[-1].append(note)
+        used += tokens
+    return groups
+
+
+def _parallel(fn, items):
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL, max(1, len(items)))) as executor:
+        return list(executor.map(bind(fn), items))
+
+
+def save_notes(notes, output_filename):
+    from docx import Document
+
+    output_dir = os.path.dirname(output_filename)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    doc = Document()
+    for key, value in notes.items():
+        doc.add_heading(_heading(key), level=1)
+        doc.add_paragraph(value)
+        doc.add_paragraph()
+    doc.save(output_filename)
+    return output_filename
+
+
+def load_notes(filename):
+    # save_notes로 저장한 문서에서 항목별 내용을 다시 읽는다. 한 항목만 다시 만들 때 나머지를 여기서 가져온다
+    from docx import Document
+
+    headings = {_heading(key): key for key, _ in ANALYSES}
+    notes = {}
+    key = None
+    for paragraph in Document(filename).paragraphs:
+        if paragraph.style.name.startswith("Heading"):
+            key = headings.get(paragraph.text)
+            if key is not None:
+                notes[key] = []
+        elif key is not None and paragraph.text:
+            notes[key].append(paragraph.text)
+    return {key: "\n".join(lines) for key, lines in notes.items()}
+
+
+def _heading(key):
+    return ''.join(word.capitalize() for word in key.split('_'))
@@ -0,0 +1,189 @@
+# 전사 전에 오디오를 작게 만든다: 모노 16kHz로 바꾸고 긴 무음을 줄인 뒤 Opus(안 되면 MP3)로 다시 인코딩.
+# 결과는 원본 내용 해시로 캐시해서 같은 파일을 다시 전사할 때는 인코딩도 건너뛴다
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from services.cancel import check, on_cancel
+from services.paths import data_dir
+
+SAMPLE_RATE = 16000
+# 말소리 전사에는 이 정도 비트레이트로 충분하다
+OPUS_BITRATE = "24k"
+MP3_BITRATE = "32k"
+# 음성용 모드에 중간 압축 수준: 최고 수준(10)과 크기는 거의 같고 인코딩은 절반 정도 걸린다
+OPUS_PARAMETERS = ["-application", "voip", "-compression_level", "5"]
+# 이보다 긴 무음을 짧게 줄인다. ffmpeg 버전에 따라 KEEP_SILENCE_MS, 또는 여기에 MIN_SILENCE_MS를 더한 만큼 남는다
+MIN_SILENCE_MS = 1000
+KEEP_SILENCE_MS = 300
+# 녹음 평균 음량보다 이만큼 작으면 무음으로 본다
+SILENCE_THRESH_DB = 16
+DEFAULT_MAX_MB = 500
+# 설정이 바뀌면 캐시 키도 바뀌도록 키에 섞는다
+SETTINGS_VERSION = (
+    f"v2:{SAMPLE_RATE}:{OPUS_BITRATE}:{MP3_BITRATE}:{MIN_SILENCE_MS}:{KEEP_SILENCE_MS}:{SILENCE_THRESH_DB}"
+)
+AUDIO_EXTENSIONS = (".ogg", ".mp3")
+# 줄여도 원본보다 작아지지 않았던 파일의 표시. 다음에는 인코딩 없이 원본을 쓴다
+SKIP_EXTENSION = ".skip"
+
+_MEAN_VOLUME_RE = re.compile(r"mean_volume:\s*(-?[\d.]+) dB")
+_lock = threading.Lock()
+
+
+def enabled():
+    return os.getenv("AUDIO_PREPROCESS", "1") != "0"
+
+
+def cache_dir():
+    path = os.path.join(data_dir(), "audio")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def prepare_audio(path, trim_silence=True):
+    # 전사에 보낼 파일 경로를 돌려준다. ffmpeg가 없거나 더 작아지지 않으면 원본을 그대로 쓴다.
+    # 디코딩/무음 제거/인코딩은 ffmpeg 안에서 스트리밍으로 처리하므로 긴 녹음도 메모리에 다 올리지 않는다
+    if not enabled():
+        return path
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return path
+
+    key = _cache_key(path, trim_silence)
+    base_path = os.path.join(cache_dir(), key)
+    for extension in AUDIO_EXTENSIONS + (SKIP_EXTENSION,):
+        cached = base_path + extension
+        if os.path.exists(cached):
+            os.utime(cached)
+            return path if extension == SKIP_EXTENSION else cached
+
+    filters = []
+    if trim_silence:
+        mean_volume = _mean_volume(ffmpeg, path)
+        if mean_volume is not None:
+            filters.append(silence_filter(mean_volume - SILENCE_THRESH_DB))
+
+    output = _encode(ffmpeg, path, filters, base_path)
+    if output is None:
+        return path
+    if os.path.getsize(output) >= os.path.getsize(path):
+        os.remove(output)
+        open(base_path + SKIP_EXTENSION, "wb").close()
+        return path
+    _evict()
+    return output
+
+
+def silence_filter(threshold_db, min_silence_ms=MIN_SILENCE_MS, keep_silence_ms=KEEP_SILENCE_MS):
+    # 앞쪽 무음과 중간의 긴 무음을 잘라내되 단어가 잘리지 않게 keep_silence_ms만큼은 남긴다
+    threshold = f"{threshold_db:.1f}dB"
+    return (
+        f"silenceremove=start_periods=1:start_threshold={threshold}:start_silence={keep_silence_ms / 1000}"
+        f":stop_periods=-1:stop_duration={min_silence_ms / 1000}:stop_threshold={threshold}"
+        f":stop_silence={keep_silence_ms / 1000}"
+    )
+
+
+def export_compact(audio, buffer_or_path):
+    # Opus(ogg)로 먼저 시도하고, ffmpeg에 libopus가 없으면 MP3로 내보낸다. 사용한 확장자를 돌려준다
+    try:
+        audio.export(buffer_or_path, format="ogg", codec="libopus", bitrate=OPUS_BITRATE,
+                     parameters=OPUS_PARAMETERS)
+        return ".ogg"
+    except Exception:
+        if hasattr(buffer_or_path, "seek"):
+            buffer_or_path.seek(0)
+            buffer_or_path.truncate()
+        audio.export(buffer_or_path, format="mp3", bitrate=MP3_BITRATE)
+        return ".mp3"
+
+
+def _mean_volume(ffmpeg, path):
+    # pydub의 dBFS처럼 전체 평균 음량(dB)을 구한다. 디코딩만 하고 결과는 버린다
+    returncode, stderr = _run(
+        [ffmpeg, "-nostdin", "-hide_banner", "-i", path, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+         "-af", "volumedetect", "-f", "null", "-"]
+    )
+    match = _MEAN_VOLUME_RE.search(stderr)
+    if returncode != 0 or match is None:
+        return None
+    return float(match.group(1))
+
+
+def _encode(ffmpeg, path, filters, base_path):
+    # Opus(ogg)로 먼저 시도하고, ffmpeg에 libopus가 없으면 MP3로 내보낸다
+    tmp_path = f"{base_path}.{threading.get_ident()}.tmp"
+    command = [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y", "-i", path,
+               "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE)]
+    if filters:
+        command += ["-af", ",".join(filters)]
+    codecs = (
+        (".ogg", ["-c:a", "libopus", "-b:a", OPUS_BITRATE] + OPUS_PARAMETERS + ["-f", "ogg"]),
+        (".mp3", ["-c:a", "libmp3lame", "-b:a", MP3_BITRATE, "-f", "mp3"]),
+    )
+    try:
+        for extension, options in codecs:
+            returncode, _ = _run(command + options + [tmp_path])
+            if returncode == 0:
+                output = base_path + extension
+                os.replace(tmp_path, output)
+                return output
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _run(command):
+    # 작업이 취소되면 ffmpeg를 바로 끝낸다. 시작 직후 취소되어 kill을 등록하지 못한 경우도
+    # 예외가 나면 프로세스를 끝내고 기다려서 캐시 파일을 계속 쓰지 않게 한다
+    check()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        with on_cancel(process.kill):
+            _, stderr = process.communicate()
+        check()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    return process.returncode, stderr.decode("utf-8", errors="ignore")
+
+
+def _cache_key(path, trim_silence):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    digest.update(f"{SETTINGS_VERSION}:{trim_silence}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _evict():
+    # 캐시 폴더가 한도를 넘으면 오래 안 쓴 파일부터 지운다
+    max_bytes = int(os.getenv("AUDIO_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+    with _lock:
+        entries = []
+        for name in os.listdir(cache_dir()):
+            if not name.endswith(AUDIO_EXTENSIONS + (SKIP_EXTENSION,)):
+                continue
+            full = os.path.join(cache_dir(), name)
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, full))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, full in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(full)
+                total -= size
+            except OSError:
+                pass
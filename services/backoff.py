@@ -0,0 +1,30 @@
+# 지수 백오프 + 지터 기반 대기/폴링 헬퍼
+import random
+import time
+
+from services.cancel import sleep as cancel_sleep
+
+
+def backoff_delays(initial=0.5, factor=2.0, maximum=8.0, jitter=0.5):
+    # 매번 delay를 factor배 늘리되, (1 - jitter) ~ 1 사이 비율로 흔들어 동시 요청이 몰리지 않게 한다
+    delay = initial
+    while True:
+        yield random.uniform(delay * (1 - jitter), delay)
+        delay = min(delay * factor, maximum)
+
+
+def poll(fetch, is_done, timeout, on_poll=None, sleep=cancel_sleep, **delay_options):
+    # is_done(결과)가 참이 될 때까지 fetch()를 반복하고, timeout(초)을 넘기면 TimeoutError.
+    # 기본 sleep은 현재 작업이 취소되면 바로 깨어나 Cancelled를 던진다
+    deadline = time.monotonic() + timeout
+    for delay in backoff_delays(**delay_options):
+        result = fetch()
+        if on_poll is not None:
+            on_poll(result)
+        if is_done(result):
+            return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"{timeout:.0f}초 안에 작업이 끝나지 않았습니다.")
+        sleep(min(delay, remaining))
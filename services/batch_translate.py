@@ -0,0 +1,248 @@
+# 파일/폴더 단위 일괄 번역. 진행 결과를 체크포인트 파일에 바로 기록하므로 중간에 멈춰도 이어서 번역할 수 있다
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from services.cancel import Cancelled, bind
+from services.tokens import count_tokens
+from services.translation import TRANSLATE_MODEL, split_segments, translate_segment
+
+SUPPORTED_EXTENSIONS = (".txt", ".docx", ".jsonl")
+MAX_SEGMENT_TOKENS = 1500
+MAX_PARALLEL = 4
+JSONL_FIELD = "text"
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。])\s+")
+
+
+def collect_inputs(path):
+    if os.path.isdir(path):
+        found = []
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    found.append(os.path.join(root, name))
+        return found
+    return [path]
+
+
+def output_path_for(source, root, output_root):
+    # 파일 하나면 옆에 name.ko.ext, 폴더면 output_root 아래에 같은 구조로 저장한다
+    if output_root is None:
+        name, ext = os.path.splitext(source)
+        return f"{name}.ko{ext}"
+    relative = os.path.relpath(source, root)
+    return os.path.join(output_root, relative)
+
+
+def split_to_token_limit(text, max_tokens=MAX_SEGMENT_TOKENS):
+    if count_tokens(text, TRANSLATE_MODEL) <= max_tokens:
+        return [text]
+
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        candidate = f"{current} {sentence}" if current else sentence
+        if count_tokens(candidate, TRANSLATE_MODEL) <= max_tokens:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        # 한 문장이 너무 길면 글자 수로 잘라낸다
+        while count_tokens(sentence, TRANSLATE_MODEL) > max_tokens:
+            cut = max(1, len(sentence) * max_tokens // count_tokens(sentence, TRANSLATE_MODEL))
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:]
+        current = sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def read_units(path):
+    # 번역할 단위 목록과, 번역 결과로 파일을 다시 만드는 함수를 돌려준다
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".docx":
+        from docx import Document
+        document = Document(path)
+        units = [paragraph.text for paragraph in document.paragraphs]
+
+        def write(translated, output_path):
+            for paragraph, text in zip(document.paragraphs, translated):
+                if paragraph.text.strip():
+                    paragraph.text = text
+            document.save(output_path)
+        return units, write
+
+    if ext == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        units = [_jsonl_text(r) for r in records]
+
+        def write(translated, output_path):
+            # 번역할 문자열이 없던 줄(숫자, 목록, text가 없는 객체 등)은 그대로 쓴다
+            with open(output_path, "w", encoding="utf-8") as f:
+                for record, text in zip(records, translated):
+                    if isinstance(record, str):
+                        record = text
+                    elif _jsonl_text(record):
+                        record = dict(record, **{JSONL_FIELD: text})
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return units, write
+
+    with open(path, "r", encoding="utf-8") as f:
+        units = split_segments(f.read())
+
+    def write(translated, output_path):
+        # 문단 사이 공백은 번역하지 않았으므로 원문 그대로 들어 있다
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("".join(translated))
+    return units, write
+
+
+def _jsonl_text(record):
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict) and isinstance(record.get(JSONL_FIELD), str):
+        return record[JSONL_FIELD]
+    return ""
+
+
+def segment_hash(text):
+    # 체크포인트의 번역이 지금 원문 구간과 같은 내용에서 나온 것인지 확인하는 용도
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class BatchTranslator:
+    def __init__(self, client, source, output_root=None, max_workers=MAX_PARALLEL,
+                 max_segment_tokens=MAX_SEGMENT_TOKENS, on_progress=None):
+        self.client = client
+        self.source = source
+        self.output_root = output_root
+        if output_root is None and os.path.isdir(source):
+            self.output_root = source.rstrip(os.sep) + "_ko"
+        self.max_workers = max_workers
+        self.max_segment_tokens = max_segment_tokens
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+
+    def run(self):
+        files = collect_inputs(self.source)
+        outputs = []
+        for path in files:
+            outputs.append(self.translate_file(path))
+        return outputs
+
+    def translate_file(self, path):
+        output_path = output_path_for(path, self.source, self.output_root)
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        checkpoint_path = output_path + ".partial.jsonl"
+
+        units, write = read_units(path)
+        segments = []
+        for unit_index, unit in enumerate(units):
+            if self._skip_unit(path, unit_index, unit):
+                continue
+            for piece_index, piece in enumerate(split_to_token_limit(unit.strip(), self.max_segment_tokens)):
+                segments.append((f"{unit_index}:{piece_index}", piece))
+
+        # 원문이 바뀐 구간의 예전 번역은 버리고 다시 번역한다
+        hashes = {sid: segment_hash(text) for sid, text in segments}
+        done = self._load_checkpoint(checkpoint_path, hashes)
+        self._terminate_last_line(checkpoint_path)
+        pending = [(sid, text) for sid, text in segments if sid not in done]
+        total = len(segments)
+        self._report(total - len(pending), total, path)
+
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            futures = {
+                executor.submit(bind(translate_segment), self.client, text, feature="batch_translate"): sid
+                for sid, text in pending
+            }
+            failed = []
+            for future in as_completed(futures):
+                sid = futures[future]
+                try:
+                    translated = future.result()
+                except Cancelled:
+                    # 아직 시작하지 않은 구간은 보내지 않는다
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                except Exception as e:
+                    # 한 구간이 실패해도 나머지 결과는 체크포인트에 남겨서 다시 실행할 때 이어 가게 한다
+                    failed.append(e)
+                    continue
+                with self._lock:
+                    done[sid] = translated
+                    checkpoint.write(json.dumps(
+                        {"id": sid, "hash": hashes[sid], "text": translated}, ensure_ascii=False
+                    ) + "\n")
+                    checkpoint.flush()
+                    self._report(len(done), total, path)
+
+        if failed:
+            raise Exception(
+                f"{len(failed)}개 구간을 번역하지 못했습니다: {path} ({failed[0]}) "
+                "다시 실행하면 남은 구간만 번역합니다."
+            ) from failed[0]
+
+        translated_units = []
+        for unit_index, unit in enumerate(units):
+            pieces = []
+            piece_index = 0
+            while f"{unit_index}:{piece_index}" in done:
+                pieces.append(done[f"{unit_index}:{piece_index}"])
+                piece_index += 1
+            if not pieces:
+                translated_units.append(unit)
+                continue
+            leading = unit[:len(unit) - len(unit.lstrip())]
+            trailing = unit[len(unit.rstrip()):]
+            translated_units.append(f"{leading}{' '.join(pieces)}{trailing}")
+
+        write(translated_units, output_path)
+        os.remove(checkpoint_path)
+        return output_path
+
+    def _skip_unit(self, path, unit_index, unit):
+        # .txt의 홀수 번째 단위는 문단 사이 공백이다
+        if path.lower().endswith(".txt") and unit_index % 2 == 1:
+            return True
+        return not unit.strip()
+
+    def _load_checkpoint(self, checkpoint_path, hashes):
+        done = {}
+        if not os.path.exists(checkpoint_path):
+            return done
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 마지막 줄이 잘렸을 수 있다
+                    continue
+                # 해시가 없는 예전 기록이나 원문이 바뀐 구간은 쓰지 않는다
+                if not isinstance(record, dict) or record.get("hash") != hashes.get(record.get("id")):
+                    continue
+                done[record["id"]] = record["text"]
+        return done
+
+    def _terminate_last_line(self, checkpoint_path):
+        # 잘린 마지막 줄 뒤에 새 기록이 이어 붙지 않도록 줄바꿈을 맞춰 둔다
+        if not os.path.exists(checkpoint_path) or os.path.getsize(checkpoint_path) == 0:
+            return
+        with open(checkpoint_path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _report(self, done, total, path):
+        if self.on_progress is not None:
+            self.on_progress(done, total, path)
@@ -0,0 +1,120 @@
+# 협조적 취소: 워커가 CancelToken을 만들어 scope()로 현재 작업에 걸어 두면
+# transport/backoff/스트림이 그 토큰을 보고 대기를 끊고, 진행 중인 HTTP 연결을 닫고, Cancelled를 던진다.
+# 토큰은 contextvar로 전달되므로 서비스 함수 시그니처는 그대로 두고,
+# 다른 스레드(ThreadPoolExecutor)에 일을 넘길 때만 bind()로 감싸서 같은 토큰을 이어 준다
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("cancel_token", default=None)
+
+
+class Cancelled(Exception):
+    def __init__(self, message="작업이 취소되었습니다."):
+        super().__init__(message)
+
+
+class CancelToken:
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._next_id = 0
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        # 어느 스레드에서 불러도 된다. 콜백은 한 번만 호출된다
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+    def sleep(self, seconds):
+        # 취소되면 기다리던 중이라도 바로 Cancelled
+        if self._event.wait(max(0.0, seconds)):
+            raise Cancelled()
+
+    def add_callback(self, callback):
+        # 취소될 때 부를 함수를 등록하고 remove_callback()용 핸들을 돌려준다. 이미 취소됐으면 바로 부른다
+        with self._lock:
+            if not self._event.is_set():
+                self._next_id += 1
+                self._callbacks[self._next_id] = callback
+                return self._next_id
+        callback()
+        return None
+
+    def remove_callback(self, handle):
+        if handle is None:
+            return
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def scope(token):
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+@contextmanager
+def on_cancel(callback):
+    # with 블록이 도는 동안 현재 작업이 취소되면 callback()을 부른다 (소켓 닫기 등)
+    token = current()
+    if token is None:
+        yield
+        return
+    token.raise_if_cancelled()
+    handle = token.add_callback(callback)
+    try:
+        yield
+    finally:
+        token.remove_callback(handle)
+
+
+def check():
+    token = current()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def sleep(seconds):
+    token = current()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.sleep(seconds)
+
+
+def bind(fn):
+    # 지금 작업의 토큰을 다른 스레드에서도 쓰도록 fn을 감싼다
+    token = current()
+
+    def run(*args, **kwargs):
+        with scope(token):
+            check()
+            return fn(*args, **kwargs)
+    return run
@@ -0,0 +1,216 @@
+# RudeBot 대화 기억: 세션마다 턴을 쌓되, 프롬프트에 들어가는 이전 대화는 토큰 예산 안으로 묶는다.
+# 오래된 턴은 백그라운드에서 요약 하나로 접고, 요약이 바뀌기 전까지는 턴이 뒤에 붙기만 하므로
+# 매 요청의 앞부분(시스템 프롬프트 + 요약 + 이전 턴)이 그대로 유지된다
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cancel import CancelToken, scope
+from services.tokens import count_message_tokens, count_tokens
+from services.transport import call
+
+# 프롬프트에 넣을 이전 대화(요약 + 최근 턴)의 최대 토큰 수
+HISTORY_TOKEN_BUDGET = 2000
+# 요약할 때 최근 턴이 이 정도만 남도록 오래된 턴을 한꺼번에 접는다 (요약이 자주 바뀌지 않게)
+COMPACT_TARGET_RATIO = 0.5
+MIN_RECENT_TURNS = 2
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_MAX_TOKENS = 300
+MAX_SESSIONS = 20
+
+# 요약은 대화 응답을 막지 않도록 전용 스레드 하나에서 순서대로 만든다
+_summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversation-summary")
+# 요약 요청은 어느 워커에도 속하지 않으므로 앱을 끝낼 때 shutdown()이 이 토큰으로 끊는다
+_summary_cancel = CancelToken()
+
+
+def shutdown():
+    # 진행 중인 요약 요청을 끊고 기다리던 요약은 버린다
+    _summary_cancel.cancel()
+    _summary_executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Turn:
+    def __init__(self, question, answer):
+        self.question = question
+        self.answer = answer
+        # 턴마다 한 번만 센다
+        self.tokens = count_message_tokens(self.messages()) - 3
+
+    def messages(self):
+        return [
+            {"role": "user", "content": self.question},
+            {"role": "assistant", "content": self.answer}
+        ]
+
+
+class Conversation:
+
+    def __init__(self, session_id, client=None, budget=HISTORY_TOKEN_BUDGET):
+        self.session_id = session_id
+        self.client = client
+        self.budget = budget
+        self.turns = []
+        self.summary = ""
+        self.summary_tokens = 0
+        # turns[:summarized]는 이미 summary에 들어가 있다
+        self.summarized = 0
+        self._compacting = False
+        self._context = None
+        self._lock = threading.Lock()
+
+    def context(self):
+        # 이번 질문 앞에 붙일 메시지들. 턴이 추가되거나 요약이 바뀔 때만 다시 만든다
+        with self._lock:
+            if self._context is None:
+                self._context = self._build_context()
+            return list(self._context)
+
+    def add_turn(self, question, answer):
+        with self._lock:
+            self.turns.append(Turn(question, answer))
+            self._context = None
+            compact = self._needs_compaction()
+            if compact:
+                self._compacting = True
+        if compact:
+            self._schedule_compaction()
+
+    def history_tokens(self):
+        with self._lock:
+            return self.summary_tokens + sum(turn.tokens for turn in self.turns[self.summarized:])
+
+    def _build_context(self):
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+
+        # 요약이 아직 만들어지는 중이라 예산을 넘으면 오래된 턴부터 잠시 빼 둔다
+        remaining = self.budget - self.summary_tokens
+        recent = []
+        for turn in reversed(self.turns[self.summarized:]):
+            if turn.tokens > remaining and len(recent) >= MIN_RECENT_TURNS:
+                break
+            remaining -= turn.tokens
+            recent.append(turn)
+        for turn in reversed(recent):
+            messages.extend(turn.messages())
+        return messages
+
+    def _needs_compaction(self):
+        if self._compacting or self.client is None:
+            return False
+        pending = self.turns[self.summarized:]
+        if len(pending) <= MIN_RECENT_TURNS:
+            return False
+        return self.summary_tokens + sum(turn.tokens for turn in pending) > self.budget
+
+    def _schedule_compaction(self):
+        try:
+            _summary_executor.submit(self._compact)
+        except RuntimeError:
+            # 앱이 끝나는 중이면 더 요약하지 않는다
+            with self._lock:
+                self._compacting = False
+
+    def _compact(self):
+        with scope(_summary_cancel):
+            self._fold()
+
+    def _fold(self):
+        succeeded = False
+        try:
+            with self._lock:
+                start = self.summarized
+                # 최근 턴이 예산의 절반 이하(최소 MIN_RECENT_TURNS개)로 남도록 오래된 턴을 접는다
+                end = len(self.turns) - MIN_RECENT_TURNS
+                keep_tokens = sum(turn.tokens for turn in self.turns[end:])
+                while end > start and keep_tokens + self.turns[end - 1].tokens <= self.budget * COMPACT_TARGET_RATIO:
+                    end -= 1
+                    keep_tokens += self.turns[end].tokens
+                folded = self.turns[start:end]
+                previous = self.summary
+            if not folded:
+                return
+
+            summary = summarize(self.client, previous, folded)
+            with self._lock:
+                # 요약 중에 다른 요약이 끼어들 수 없으므로 그대로 반영한다
+                self.summary = summary
+                self.summary_tokens = count_tokens(summary) + 4
+                self.summarized = end
+                self._context = None
+            succeeded = True
+        except Exception:
+            # 요약에 실패해도 대화는 계속된다 (그동안은 예산에 맞춰 오래된 턴이 빠지고,
+            # 다음 턴이 추가될 때 다시 시도한다)
+            pass
+        finally:
+            with self._lock:
+                self._compacting = False
+                again = succeeded and self._needs_compaction()
+                if again:
+                    self._compacting = True
+            if again:
+                self._schedule_compaction()
+
+
+def summarize(client, previous, turns):
+    transcript = "\n".join(
+        f"User: {turn.question}\nRudeBot: {turn.answer}" for turn in turns
+    )
+    if previous:
+        transcript = f"Earlier summary:\n{previous}\n\nNew turns:\n{transcript}"
+    response = call(
+        "chat",
+        client.chat.completions.create,
+        feature="rudebot_summary",
+        model=SUMMARY_MODEL,
+        max_tokens=SUMMARY_MAX_TOKENS,
+        messages=[
+            {"role": "system",
+             "content": "Summarize this chat so the assistant can continue it. Keep facts the user "
+                        "shared, open questions and the tone. Reply in the language of the chat, "
+                        "in a few short sentences."},
+            {"role": "user", "content": transcript}
+        ]
+    )
+    return response.choices[0].message.content.strip()
+
+
+class SessionStore:
+    # 최근에 쓴 세션 MAX_SESSIONS개만 메모리에 둔다
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id, client=None):
+        with self._lock:
+            conversation = self._sessions.get(session_id)
+            if conversation is None:
+                conversation = Conversation(session_id, client)
+                self._sessions[session_id] = conversation
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+                if conversation.client is None:
+                    conversation.client = client
+            return conversation
+
+    def drop(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
@@ -0,0 +1,98 @@
+# 파일 내용 해시 -> 업로드된 file_id / 벡터스토어 등록 여부를 기억하는 영구 캐시
+import hashlib
+import json
+import os
+import threading
+
+from services.paths import data_path
+
+
+class UploadCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=None):
+        self.path = path or data_path("upload_cache.json")
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def file_hash(self, file_path):
+        # 크기와 수정 시각이 그대로면 해시를 다시 계산하지 않는다
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._data["stat"].get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        with self._lock:
+            self._data["stat"][key] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "sha256": sha256
+            }
+            self._save()
+        return sha256
+
+    def file_id(self, sha256):
+        with self._lock:
+            entry = self._data["files"].get(sha256)
+            return entry["file_id"] if entry else None
+
+    def remember_upload(self, sha256, file_id):
+        with self._lock:
+            self._data["files"][sha256] = {"file_id": file_id, "indexed_store_ids": []}
+            self._save()
+
+    # 예전 기록(vector_store_ids)은 file_id 속성 없이 등록된 것이라 검색 범위를 좁힐 수 없으므로
+    # 새 키(indexed_store_ids)만 보고, 예전 파일은 속성을 붙여 한 번 더 등록하게 한다
+    def is_indexed(self, sha256, vector_store_id):
+        with self._lock:
+            entry = self._data["files"].get(sha256)
+            return bool(entry) and vector_store_id in entry.get("indexed_store_ids", [])
+
+    def mark_indexed(self, sha256, vector_store_id):
+        with self._lock:
+            entry = self._data["files"].get(sha256)
+            if entry is None:
+                return
+            indexed = entry.setdefault("indexed_store_ids", [])
+            if vector_store_id not in indexed:
+                indexed.append(vector_store_id)
+                self._save()
+
+    def forget(self, sha256):
+        with self._lock:
+            if self._data["files"].pop(sha256, None) is not None:
+                self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("files", {})
+        data.setdefault("stat", {})
+        return data
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
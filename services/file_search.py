@@ -0,0 +1,132 @@
+# 벡터 스토어 파일 검색: 업로드/인덱싱은 내용 해시로 한 번만 하고 질문에 답한다 (Qt 없이 사용 가능)
+import time
+
+from services.backoff import poll
+from services.cancel import Cancelled
+from services.file_cache import UploadCache
+from services.transport import call
+from services.vector_store import get_vector_store_id
+
+FILE_SEARCH_MODEL = "gpt-4.1"
+# 인덱싱 대기 최대 시간(초)
+INDEXING_TIMEOUT = 300
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+class FileSearch:
+
+    def __init__(self, client, file_path, vector_store_id=None, on_progress=None):
+        self.client = client
+        self.file_path = file_path
+        self.vector_store_id = vector_store_id
+        self.on_progress = on_progress
+
+    def ask(self, question):
+        if self.vector_store_id is None:
+            self._report("벡터 스토어를 준비 중입니다...")
+            self.vector_store_id = get_vector_store_id(self.client)
+
+        cache = UploadCache.instance()
+        sha256 = cache.file_hash(self.file_path)
+
+        # 같은 내용의 파일이 이미 이 벡터스토어에 들어가 있으면 업로드/인덱싱을 건너뛴다
+        file_id = cache.file_id(sha256)
+        if not cache.is_indexed(sha256, self.vector_store_id):
+            file_id = self._index_file(cache, sha256, file_id)
+
+        response = call(
+            "responses",
+            self.client.responses.create,
+            feature="filesearch",
+            model=FILE_SEARCH_MODEL,
+            input=question,
+            tools=[
+                {
+                    "type": "file_search",
+                    "vector_store_ids": [self.vector_store_id],
+                    "max_num_results": 5,
+                    # 스토어에는 이전에 물어본 파일들도 들어 있으므로 이번 파일에서만 찾는다
+                    "filters": {"type": "eq", "key": "file_id", "value": file_id}
+                }
+            ],
+            include=["file_search_call.results"]
+        )
+
+        try:
+            answer = response.output_text
+        except:
+            answer = "응답을 해석할 수 없습니다."
+
+        return {
+            "file_id": file_id,
+            "vector_store_id": self.vector_store_id,
+            "answer": answer
+        }
+
+    def _report(self, message):
+        if self.on_progress is not None:
+            self.on_progress(message)
+
+    def _index_file(self, cache, sha256, file_id):
+        if file_id is not None:
+            try:
+                self._add_to_vector_store(file_id)
+                cache.mark_indexed(sha256, self.vector_store_id)
+                return file_id
+            except Cancelled:
+                raise
+            except Exception:
+                # 서버에서 파일이 지워졌으면 캐시를 비우고 새로 올린다
+                cache.forget(sha256)
+
+        with open(self.file_path, "rb") as f:
+            def upload(**options):
+                f.seek(0)
+                return self.client.files.create(file=f, purpose="assistants", **options)
+
+            uploaded = call("upload", upload, feature="filesearch")
+        file_id = uploaded.id
+        cache.remember_upload(sha256, file_id)
+
+        self._add_to_vector_store(file_id)
+        cache.mark_indexed(sha256, self.vector_store_id)
+        return file_id
+
+    def _add_to_vector_store(self, file_id):
+        vector_file = call(
+            "api",
+            self.client.vector_stores.files.create,
+            feature="filesearch",
+            vector_store_id=self.vector_store_id,
+            file_id=file_id,
+            attributes={"file_id": file_id}
+        )
+
+        # 목록 전체가 아니라 방금 추가한 파일만 조회하고, 점점 간격을 늘려가며 확인한다
+        started = time.monotonic()
+
+        def fetch():
+            return call(
+                "poll",
+                self.client.vector_stores.files.retrieve,
+                file_id,
+                feature="filesearch",
+                vector_store_id=self.vector_store_id
+            )
+
+        def report(result):
+            elapsed = time.monotonic() - started
+            self._report(f"파일 인덱싱 중입니다... ({result.status}, {elapsed:.0f}초)")
+
+        if vector_file.status not in TERMINAL_STATUSES:
+            vector_file = poll(
+                fetch,
+                lambda result: result.status in TERMINAL_STATUSES,
+                timeout=INDEXING_TIMEOUT,
+                on_poll=report
+            )
+
+        if vector_file.status != "completed":
+            last_error = getattr(vector_file, "last_error", None)
+            reason = getattr(last_error, "message", None) or vector_file.status
+            raise Exception(f"파일 인덱싱에 실패했습니다: {reason}")
@@ -0,0 +1,340 @@
+# 파인튜닝 데이터 파이프라인: JSONL을 한 줄씩 읽으며 검증/토큰 계산/중복 제거를 하고,
+# train/validation 파일(필요하면 여러 조각)로 나눠 쓴 뒤 업로드와 작업 진행 추적까지 한다
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from services.backoff import poll
+from services.cancel import bind
+from services.tokens import count_message_tokens
+from services.transport import call
+
+FINETUNE_MODEL = "gpt-3.5-turbo-0125"
+ALLOWED_ROLES = ("system", "user", "assistant")
+# 예제 하나가 이 토큰 수를 넘으면 학습 때 잘리므로 미리 뺀다
+MAX_EXAMPLE_TOKENS = 16385
+MIN_TRAINING_EXAMPLES = 10
+# SimHash(64비트) 해밍 거리가 이 이하면 거의 같은 예제로 본다
+NEAR_DUPLICATE_DISTANCE = 3
+SHINGLE_CHARS = 4
+
+# 에폭 수 기본값 추정 (OpenAI가 n_epochs를 자동으로 정하는 방식과 같은 기준)
+TARGET_EPOCHS = 3
+MIN_TARGET_EXAMPLES = 100
+MAX_TARGET_EXAMPLES = 25000
+MIN_EPOCHS = 1
+MAX_EPOCHS = 25
+
+# 학습 토큰 100만 개당 가격(USD). 목록에 없는 모델은 FINETUNE_PRICE_PER_1M 환경 변수를 쓴다
+TRAINING_PRICES = {
+    "gpt-3.5-turbo": 8.00,
+    "gpt-4o-mini": 3.00,
+    "gpt-4.1-mini": 5.00,
+    "gpt-4.1": 25.00,
+}
+
+JOB_TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+FILE_TERMINAL_STATUSES = ("processed", "error", "deleted")
+JOB_TIMEOUT = 24 * 60 * 60
+FILE_TIMEOUT = 10 * 60
+MAX_PARALLEL_UPLOADS = 4
+MAX_ISSUE_SAMPLES = 20
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def validate_example(example):
+    # 문제가 있으면 이유를 문자열로, 없으면 None을 돌려준다
+    if not isinstance(example, dict):
+        return "예제가 JSON 객체가 아닙니다"
+    messages = example.get("messages")
+    if not isinstance(messages, list) or not messages:
+        return "messages 목록이 없습니다"
+
+    for message in messages:
+        if not isinstance(message, dict):
+            return "메시지가 객체가 아닙니다"
+        role = message.get("role")
+        if role not in ALLOWED_ROLES:
+            return f"지원하지 않는 역할: {role}"
+        content = message.get("content")
+        if not isinstance(content, str) or not content.strip():
+            return f"{role} 메시지 내용이 비어 있습니다"
+        unknown = set(message) - {"role", "content", "name", "weight"}
+        if unknown:
+            return f"알 수 없는 키: {', '.join(sorted(unknown))}"
+        if "weight" in message and (role != "assistant" or message["weight"] not in (0, 1)):
+            return "weight는 assistant 메시지에만 0 또는 1로 줄 수 있습니다"
+
+    if not any(message["role"] == "assistant" for message in messages):
+        return "assistant 메시지가 없습니다"
+    return None
+
+
+def simhash(text, bits=64):
+    # 조각(문자 4개)마다 64비트 해시를 만들고, 비트 자리마다 1이 절반을 넘으면 1로 둔다
+    text = _SPACE_RE.sub(" ", text.lower()).strip()
+    shingles = {text[i:i + SHINGLE_CHARS] for i in range(max(1, len(text) - SHINGLE_CHARS + 1))}
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest(), "big"),
+               f"0{bits}b")
+        for shingle in shingles
+    ]
+    half = len(rows) / 2
+    value = 0
+    for column in zip(*rows):
+        value = value << 1 | (column.count("1") > half)
+    return value
+
+
+class DuplicateFilter:
+    # 완전 중복은 정규화한 JSON의 해시로, 거의 같은 예제는 SimHash를 4개 구간으로 나눠
+    # 한 구간이라도 같은 후보끼리만 해밍 거리를 비교한다 (전체 쌍을 비교하지 않는다)
+    BANDS = 4
+
+    def __init__(self, max_distance=NEAR_DUPLICATE_DISTANCE):
+        self.max_distance = max_distance
+        self._exact = set()
+        self._bands = [dict() for _ in range(self.BANDS)]
+
+    def check(self, messages):
+        canonical = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(canonical.encode("utf-8")).digest()[:16]
+        if digest in self._exact:
+            return "exact"
+
+        # 모든 예제에 똑같이 들어가는 system 프롬프트는 빼고 비교한다
+        text = "\n".join(m["content"] for m in messages if m["role"] != "system")
+        value = simhash(text)
+        width = 64 // self.BANDS
+        keys = [(value >> (band * width)) & ((1 << width) - 1) for band in range(self.BANDS)]
+        for band, key in enumerate(keys):
+            for other in self._bands[band].get(key, ()):
+                if bin(value ^ other).count("1") <= self.max_distance:
+                    return "near"
+
+        self._exact.add(digest)
+        for band, key in enumerate(keys):
+            self._bands[band].setdefault(key, []).append(value)
+        return None
+
+
+class ShardWriter:
+    # shard_examples마다 새 파일로 넘어간다. None이면 파일 하나에 모두 쓴다
+    def __init__(self, prefix, shard_examples=None):
+        self.prefix = prefix
+        self.shard_examples = shard_examples
+        self.paths = []
+        self.counts = []
+        self._file = None
+
+    def write(self, line):
+        if self._file is None or (self.shard_examples and self.counts[-1] >= self.shard_examples):
+            self._open_next()
+        self._file.write(line + "\n")
+        self.counts[-1] += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_next(self):
+        self.close()
+        if self.shard_examples:
+            path = f"{self.prefix}_{len(self.paths) + 1:03d}.jsonl"
+        else:
+            path = f"{self.prefix}.jsonl"
+        self._file = open(path, "w", encoding="utf-8")
+        self.paths.append(path)
+        self.counts.append(0)
+
+
+def estimate_epochs(n_examples):
+    if n_examples == 0:
+        return 0
+    if n_examples * TARGET_EPOCHS < MIN_TARGET_EXAMPLES:
+        return min(MAX_EPOCHS, math.ceil(MIN_TARGET_EXAMPLES / n_examples))
+    if n_examples * TARGET_EPOCHS > MAX_TARGET_EXAMPLES:
+        return max(MIN_EPOCHS, MAX_TARGET_EXAMPLES // n_examples)
+    return TARGET_EPOCHS
+
+
+def training_price(model):
+    for name in sorted(TRAINING_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return TRAINING_PRICES[name]
+    value = os.getenv("FINETUNE_PRICE_PER_1M")
+    return float(value) if value else None
+
+
+def prepare_dataset(source_path, output_dir, model=FINETUNE_MODEL, validation_fraction=0.1,
+                    shard_examples=None, max_tokens=MAX_EXAMPLE_TOKENS, epochs=None):
+    # 원본을 한 줄씩만 읽고 쓰므로 메모리에는 중복 판별용 해시만 남는다
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    train = ShardWriter(os.path.join(output_dir, f"{name}_train"), shard_examples)
+    validation = ShardWriter(os.path.join(output_dir, f"{name}_validation"), shard_examples)
+    duplicates = DuplicateFilter()
+
+    issues = Counter()
+    samples = []
+    kept = 0
+    tokens_total = 0
+    tokens_min = None
+    tokens_max = 0
+    train_tokens = 0
+    total_lines = 0
+
+    def reject(line_number, reason):
+        issues[reason.split(":")[0]] += 1
+        if len(samples) < MAX_ISSUE_SAMPLES:
+            samples.append((line_number, reason))
+
+    try:
+        with open(source_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                total_lines += 1
+                try:
+                    example = json.loads(line)
+                except json.JSONDecodeError as e:
+                    reject(line_number, f"JSON 오류: {e.msg}")
+                    continue
+
+                reason = validate_example(example)
+                if reason is not None:
+                    reject(line_number, reason)
+                    continue
+
+                count = count_message_tokens(example["messages"], model)
+                if count > max_tokens:
+                    reject(line_number, f"토큰 초과: {count} > {max_tokens}")
+                    continue
+
+                duplicate = duplicates.check(example["messages"])
+                if duplicate == "exact":
+                    reject(line_number, "완전 중복")
+                    continue
+                if duplicate == "near":
+                    reject(line_number, "유사 중복")
+                    continue
+
+                kept += 1
+                tokens_total += count
+                tokens_min = count if tokens_min is None else min(tokens_min, count)
+                tokens_max = max(tokens_max, count)
+                record = json.dumps(example, ensure_ascii=False)
+                # 내용 해시로 나누므로 다시 실행해도 같은 예제는 같은 쪽에 들어간다
+                bucket = int(hashlib.sha256(record.encode("utf-8")).hexdigest()[:8], 16) % 10000
+                if bucket < validation_fraction * 10000:
+                    validation.write(record)
+                else:
+                    train.write(record)
+                    train_tokens += count
+    finally:
+        train.close()
+        validation.close()
+
+    n_train = sum(train.counts)
+    n_epochs = epochs or estimate_epochs(n_train)
+    billed_tokens = train_tokens * n_epochs
+    price = training_price(model)
+    return {
+        "source": source_path,
+        "model": model,
+        "total_lines": total_lines,
+        "kept": kept,
+        "train_examples": n_train,
+        "validation_examples": sum(validation.counts),
+        "rejected": dict(issues),
+        "rejected_samples": samples,
+        "tokens_total": tokens_total,
+        "tokens_min": tokens_min or 0,
+        "tokens_max": tokens_max,
+        "tokens_mean": tokens_total / kept if kept else 0,
+        "epochs": n_epochs,
+        "billed_tokens": billed_tokens,
+        "estimated_cost": billed_tokens / 1_000_000 * price if price is not None else None,
+        "train_files": train.paths,
+        "validation_files": validation.paths,
+    }
+
+
+def upload_file(client, path):
+    with open(path, "rb") as f:
+        def upload(**options):
+            f.seek(0)
+            return client.files.create(file=f, purpose="fine-tune", **options)
+
+        uploaded = call("upload", upload, feature="finetune")
+
+    # 파일 처리(검증)가 끝나기 전에 작업을 만들면 거절되므로 처리 완료를 기다린다
+    if getattr(uploaded, "status", "processed") not in FILE_TERMINAL_STATUSES:
+        uploaded = poll(
+            lambda: call("poll", client.files.retrieve, uploaded.id, feature="finetune"),
+            lambda result: result.status in FILE_TERMINAL_STATUSES,
+            timeout=FILE_TIMEOUT
+        )
+    if uploaded.status != "processed":
+        raise Exception(f"파일 처리에 실패했습니다: {path} ({uploaded.status})")
+    return uploaded.id
+
+
+def upload_files(client, paths):
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_UPLOADS, max(1, len(paths)))) as executor:
+        return list(executor.map(bind(lambda path: upload_file(client, path)), paths))
+
+
+def start_job(client, training_file, model=FINETUNE_MODEL, validation_file=None, epochs=None, suffix=None):
+    options = {}
+    if validation_file:
+        options["validation_file"] = validation_file
+    if epochs:
+        options["hyperparameters"] = {"n_epochs": epochs}
+    if suffix:
+        options["suffix"] = suffix
+    return call(
+        "api",
+        client.fine_tuning.jobs.create,
+        feature="finetune",
+        model=model,
+        training_file=training_file,
+        **options
+    )
+
+
+def wait_for_job(client, job_id, on_poll=None, timeout=JOB_TIMEOUT):
+    # 학습은 몇 시간씩 걸리므로 5초에서 시작해 최대 1분 간격까지 늘려가며 확인한다
+    job = poll(
+        lambda: call("poll", client.fine_tuning.jobs.retrieve, job_id, feature="finetune"),
+        lambda result: result.status in JOB_TERMINAL_STATUSES,
+        timeout=timeout,
+        on_poll=on_poll,
+        initial=5.0,
+        maximum=60.0
+    )
+    if job.status != "succeeded":
+        error = getattr(job, "error", None)
+        reason = getattr(error, "message", None) or job.status
+        raise Exception(f"파인튜닝 작업이 실패했습니다: {reason}")
+    return job
+
+
+def run_jobs(client, train_files, validation_file=None, model=FINETUNE_MODEL, epochs=None,
+             suffix=None, on_poll=None, timeout=JOB_TIMEOUT):
+    # 조각이 여러 개면 앞 작업의 결과 모델에서 이어서 학습한다 (한 작업에 파일은 하나만 들어간다).
+    # epochs는 조각마다 같은 값으로 들어가므로 전체 학습 데이터 기준 값(prepare_dataset의 "epochs")을 넘긴다
+    job = None
+    for training_file in train_files:
+        job = start_job(client, training_file, model, validation_file, epochs, suffix)
+        if on_poll is not None:
+            on_poll(job)
+        job = wait_for_job(client, job.id, on_poll, timeout)
+        model = job.fine_tuned_model
+    return job
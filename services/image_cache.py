@@ -0,0 +1,86 @@
+# (model, size, prompt) 해시로 생성 이미지를 저장하는 디스크 캐시. 용량을 넘으면 오래 안 쓴 것부터 지운다
+import hashlib
+import json
+import os
+import threading
+
+from services.paths import data_dir
+
+DEFAULT_MAX_MB = 200
+
+
+class ImageCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.path.join(data_dir(), "images")
+        os.makedirs(self.directory, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("IMAGE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, size, prompt, variant=0):
+        # 같은 프롬프트로 여러 장을 만들 때는 variant마다 따로 저장한다 (0번은 기존 키 그대로)
+        parts = [model, size, prompt] if not variant else [model, size, prompt, variant]
+        raw = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # 접근 시각을 갱신해서 LRU 순서로 쓴다
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
@@ -0,0 +1,44 @@
+# 이미지 생성: 캐시에 있으면 요청 없이 바로 돌려준다 (Qt 없이 사용 가능)
+import base64
+
+from services.image_cache import ImageCache
+from services.transport import call, download
+
+IMAGE_MODEL = "dall-e-3"
+IMAGE_SIZE = "1024x1024"
+
+
+def image_key(prompt, variant=0):
+    return ImageCache.key(IMAGE_MODEL, IMAGE_SIZE, prompt, variant)
+
+
+def generate_image(client, prompt, use_cache=True, variant=0):
+    # 인코딩된 이미지 바이트(PNG)를 돌려준다. dall-e-3은 n=1만 지원하므로 여러 장은 variant별로 따로 요청한다
+    cache = ImageCache.instance()
+    key = image_key(prompt, variant)
+
+    data = cache.get(key) if use_cache else None
+    if data is not None:
+        return data
+
+    # b64_json으로 받으면 URL을 다시 내려받는 두 번째 요청이 필요 없다
+    response = call(
+        "image",
+        client.images.generate,
+        feature="image",
+        model=IMAGE_MODEL,
+        prompt=prompt,
+        size=IMAGE_SIZE,
+        n=1,
+        response_format="b64_json"
+    )
+
+    item = response.data[0]
+    if item.b64_json:
+        data = base64.b64decode(item.b64_json)
+    elif item.url:
+        data = download(item.url)
+    else:
+        raise Exception("이미지 데이터를 가져올 수 없습니다.")
+    cache.put(key, data)
+    return data
@@ -0,0 +1,31 @@
+# OpenAI 클라이언트 지연 생성: openai/httpx 임포트와 클라이언트 생성을 백그라운드 스레드에서 미리 해 둔다
+import threading
+
+
+class LazyClient:
+    # 페이지에는 이 객체를 넘기고, 워커가 속성에 처음 접근할 때 실제 클라이언트를 꺼내 쓴다.
+    # 미리 만들어 두지 못했으면 그 자리에서 만든다 (get_client()가 한 번만 만들도록 잠근다)
+
+    def __init__(self):
+        self.ready = threading.Event()
+
+    def preload(self):
+        thread = threading.Thread(target=self._preload, name="client-preload", daemon=True)
+        thread.start()
+        return self
+
+    def get(self):
+        from services.transport import get_client
+        return get_client()
+
+    def _preload(self):
+        try:
+            self.get()
+        except Exception:
+            # API 키가 없는 등의 오류는 실제로 요청할 때 워커의 오류로 다시 드러난다
+            pass
+        finally:
+            self.ready.set()
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
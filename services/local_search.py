@@ -0,0 +1,307 @@
+# 업로드 없이 로컬에서 문서를 색인하고 BM25로 검색하는 파일 검색 백엔드
+import hashlib
+import math
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import threading
+from collections import Counter
+
+from openai import OpenAIError
+
+from services.cancel import check
+from services.paths import data_path
+from services.transport import call
+
+SUPPORTED_EXTENSIONS = (".txt", ".doc", ".docx")
+CHUNK_CHARS = 800
+TOP_K = 5
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"\w+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+# .doc 바이너리에서 본문으로 볼 만한 UTF-16 문자 구간
+_DOC_TEXT_RE = re.compile(
+    "[\t\n\r\x20-\x7e\u00a0-\u024f\u2000-\u206f\u3000-\u303f\u3130-\u318f\uac00-\ud7a3\uff00-\uffef]{8,}"
+)
+
+
+def extract_text(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".docx":
+        from docx import Document
+        return "\n".join(p.text for p in Document(path).paragraphs)
+    if ext == ".doc":
+        return _extract_doc(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    for encoding in ("utf-8", "cp949"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="ignore")
+
+
+def chunk_text(text, max_chars=CHUNK_CHARS):
+    # 문단 단위로 모아서 max_chars를 넘지 않는 조각을 만든다
+    chunks = []
+    current = ""
+    for paragraph in re.split(r"\s*[\r\n]+\s*", text):
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def tokenize(text):
+    # 한글은 조사가 붙어 어절 단위로는 잘 맞지 않으므로 글자 2-gram으로 쪼갠다
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if _HANGUL_RE.search(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def collect_files(path):
+    if os.path.isdir(path):
+        found = []
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    found.append(os.path.join(root, name))
+        return found
+    return [path]
+
+
+class LocalIndex:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # CLI는 여러 스레드에서 동시에 처음 부를 수 있다. 인덱스(연결과 잠금)는 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=None):
+        self.path = path or data_path("local_index.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE,
+                size INTEGER,
+                mtime REAL,
+                sha256 TEXT
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                doc_id INTEGER,
+                position INTEGER,
+                length INTEGER,
+                text TEXT
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT,
+                chunk_id INTEGER,
+                tf INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_postings_term ON postings(term);
+            CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc_id);
+        """)
+
+    def index_path(self, path):
+        # 파일 또는 폴더를 색인하고 해당 문서 id 목록을 돌려준다. 파일 사이마다 취소를 확인한다
+        ids = []
+        for file_path in collect_files(path):
+            check()
+            ids.append(self.index_file(file_path))
+        return ids
+
+    def index_file(self, file_path):
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, size, mtime, sha256 FROM documents WHERE path = ?", (file_path,)
+            ).fetchone()
+        if row and row[1] == stat.st_size and row[2] == stat.st_mtime:
+            return row[0]
+
+        with open(file_path, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        if row and row[3] == sha256:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE documents SET size = ?, mtime = ? WHERE id = ?",
+                    (stat.st_size, stat.st_mtime, row[0])
+                )
+            return row[0]
+
+        chunks = chunk_text(extract_text(file_path))
+        # 같은 파일을 동시에 색인할 수 있으므로 기존 문서 확인과 교체를 한 트랜잭션에서 한다
+        with self._lock, self._conn:
+            current = self._conn.execute(
+                "SELECT id, sha256 FROM documents WHERE path = ?", (file_path,)
+            ).fetchone()
+            if current and current[1] == sha256:
+                # 그사이 다른 스레드가 같은 내용으로 색인을 끝냈다
+                return current[0]
+            if current:
+                self._delete_document(current[0])
+            doc_id = self._conn.execute(
+                "INSERT INTO documents (path, size, mtime, sha256) VALUES (?, ?, ?, ?)",
+                (file_path, stat.st_size, stat.st_mtime, sha256)
+            ).lastrowid
+            for position, text in enumerate(chunks):
+                terms = Counter(tokenize(text))
+                chunk_id = self._conn.execute(
+                    "INSERT INTO chunks (doc_id, position, length, text) VALUES (?, ?, ?, ?)",
+                    (doc_id, position, sum(terms.values()), text)
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                    [(term, chunk_id, tf) for term, tf in terms.items()]
+                )
+        return doc_id
+
+    def search(self, query, doc_ids=None, k=TOP_K):
+        # doc_ids가 None이면 전체에서, 빈 목록이면 찾을 문서가 없으므로 아무것도 돌려주지 않는다
+        terms = set(tokenize(query))
+        if not terms or (doc_ids is not None and not doc_ids):
+            return []
+
+        with self._lock:
+            doc_filter = ""
+            params = []
+            if doc_ids is not None:
+                doc_filter = f" WHERE doc_id IN ({','.join('?' * len(doc_ids))})"
+                params = list(doc_ids)
+            total, avg_length = self._conn.execute(
+                f"SELECT COUNT(*), AVG(length) FROM chunks{doc_filter}", params
+            ).fetchone()
+            if not total:
+                return []
+
+            scores = Counter()
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.length FROM postings p "
+                    "JOIN chunks c ON c.id = p.chunk_id WHERE p.term = ?"
+                    + (f" AND c.doc_id IN ({','.join('?' * len(doc_ids))})" if doc_ids is not None else ""),
+                    [term] + params
+                ).fetchall()
+                if not rows:
+                    continue
+                idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+                for chunk_id, tf, length in rows:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_length or 1))
+                    scores[chunk_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            results = []
+            for chunk_id, score in scores.most_common(k):
+                text, path = self._conn.execute(
+                    "SELECT c.text, d.path FROM chunks c JOIN documents d ON d.id = c.doc_id "
+                    "WHERE c.id = ?", (chunk_id,)
+                ).fetchone()
+                results.append({"score": score, "text": text, "path": path})
+            return results
+
+    def _delete_document(self, doc_id):
+        self._conn.execute(
+            "DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE doc_id = ?)",
+            (doc_id,)
+        )
+        self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+
+def answer_question(client, question, passages, model="gpt-4.1"):
+    # 상위 구절만 모델에 보내고, 네트워크가 없으면 구절을 그대로 보여준다
+    if not passages:
+        return "관련된 내용을 찾지 못했습니다."
+    if client is None:
+        return extractive_answer(passages)
+
+    context = "\n\n".join(
+        f"[{i + 1}] ({os.path.basename(p['path'])})\n{p['text']}" for i, p in enumerate(passages)
+    )
+    try:
+        # 키가 없거나(클라이언트 생성 실패) 인증/연결에 실패하면 기다리지 않고 구절을 보여준다
+        response = call(
+            "chat",
+            client.chat.completions.create,
+            feature="filesearch",
+            max_retries=0,
+            model=model,
+            messages=[
+                {"role": "system",
+                 "content": "Answer the question using only the numbered passages. "
+                            "Reply in the language of the question."},
+                {"role": "user", "content": f"{context}\n\n질문: {question}"}
+            ]
+        )
+    except OpenAIError:
+        return extractive_answer(passages)
+    return response.choices[0].message.content
+
+
+def ask_local(client, file_path, question, on_progress=None):
+    index = LocalIndex.instance()
+
+    # 바뀌지 않은 파일은 다시 색인하지 않으므로 두 번째 질문부터는 바로 검색된다
+    if on_progress is not None:
+        on_progress("로컬 색인을 준비 중입니다...")
+    doc_ids = index.index_path(file_path)
+
+    passages = index.search(question, doc_ids)
+    if on_progress is not None:
+        on_progress(f"관련 구절 {len(passages)}개를 찾았습니다. 답변 생성 중...")
+    answer = answer_question(client, question, passages)
+
+    return {
+        "doc_ids": doc_ids,
+        "passages": passages,
+        "answer": answer
+    }
+
+
+def extractive_answer(passages):
+    lines = ["(오프라인) 질문과 가장 관련 있는 구절입니다."]
+    for i, passage in enumerate(passages):
+        lines.append(f"\n[{i + 1}] {os.path.basename(passage['path'])}\n{passage['text']}")
+    return "\n".join(lines)
+
+
+def _extract_doc(path):
+    # antiword가 있으면 사용하고, 없으면 Word 97 바이너리에서 UTF-16 본문 구간만 뽑아낸다
+    if shutil.which("antiword"):
+        result = subprocess.run(["antiword", path], capture_output=True)
+        if result.returncode == 0:
+            return result.stdout.decode("utf-8", errors="ignore")
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-16le", errors="ignore")
+    return "\n".join(run.strip() for run in _DOC_TEXT_RE.findall(text) if run.strip())
@@ -0,0 +1,171 @@
+# API 호출별 지연 시간/토큰 사용량 기록. 최근 기록은 링 버퍼에 두고, 전부 JSONL로도 남긴다
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from services.paths import data_path
+
+RING_SIZE = 5000
+EXPORT_MAX_BYTES = 10 * 1024 * 1024
+
+
+class Span:
+    def __init__(self, feature, operation, model):
+        self.feature = feature
+        self.operation = operation
+        self.model = model
+        self.started_at = time.time()
+        self.started = time.monotonic()
+        self.queue_wait = 0.0
+        # 마지막 시도를 보낸 시각. 첫 바이트/첫 토큰은 여기서부터 잰다
+        self.sent = None
+        self.first_byte = None
+        self.first_token = None
+        self.finished = None
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.retries = 0
+        self.error = None
+        # 스트림처럼 호출이 끝난 뒤에도 이어지는 작업은 track() 대신 finish()에서 마무리한다
+        self.deferred = False
+
+    def mark_sent(self):
+        # 재시도하면 새 시도 기준으로 다시 잰다
+        self.sent = time.monotonic()
+        self.first_byte = None
+        self.first_token = None
+
+    def mark_first_byte(self):
+        if self.first_byte is None:
+            self.first_byte = time.monotonic()
+
+    def mark_first_token(self):
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+
+    def set_usage(self, usage):
+        if usage is None:
+            return
+        # chat.completions는 prompt/completion_tokens, responses는 input/output_tokens
+        self.prompt_tokens = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None)
+        self.completion_tokens = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None)
+
+    def to_record(self):
+        def since(start, moment):
+            return None if moment is None else round(moment - start, 4)
+
+        sent = self.sent if self.sent is not None else self.started
+        total = since(self.started, self.finished)
+        # latency는 스케줄러 대기를 뺀 요청 시간(재시도와 백오프 포함), total은 대기까지 포함한 전체 시간
+        return {
+            "time": self.started_at,
+            "feature": self.feature,
+            "operation": self.operation,
+            "model": self.model,
+            "queue_wait": round(self.queue_wait, 4),
+            "ttfb": since(sent, self.first_byte),
+            "ttft": since(sent, self.first_token),
+            "latency": None if total is None else round(max(0.0, total - self.queue_wait), 4),
+            "total": total,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "retries": self.retries,
+            "error": self.error,
+        }
+
+
+class MetricsRecorder:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, size=RING_SIZE, export_path=None):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+        if export_path is None:
+            export_path = os.getenv("METRICS_EXPORT_PATH") or data_path("metrics.jsonl")
+        self.export_path = export_path
+
+    @contextmanager
+    def track(self, feature, operation, model=None):
+        span = Span(feature, operation, model)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            self.finish(span)
+            raise
+        if not span.deferred:
+            self.finish(span)
+
+    def finish(self, span):
+        if span.finished is not None:
+            return
+        span.finished = time.monotonic()
+        record = span.to_record()
+        with self._lock:
+            self._records.append(record)
+            self._export(record)
+
+    def records(self, feature=None):
+        with self._lock:
+            records = list(self._records)
+        if feature is None:
+            return records
+        return [r for r in records if r["feature"] == feature]
+
+    def summary(self):
+        by_feature = {}
+        for record in self.records():
+            by_feature.setdefault(record["feature"], []).append(record)
+
+        summary = {}
+        for feature, records in sorted(by_feature.items()):
+            latencies = [r["latency"] for r in records if r["latency"] is not None]
+            ttfts = [r["ttft"] for r in records if r["ttft"] is not None]
+            waits = [r["queue_wait"] for r in records]
+            summary[feature] = {
+                "count": len(records),
+                "errors": sum(1 for r in records if r["error"]),
+                "retries": sum(r["retries"] for r in records),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99),
+                "ttft_p50": percentile(ttfts, 50),
+                "ttft_p95": percentile(ttfts, 95),
+                "queue_wait_p95": percentile(waits, 95),
+                "prompt_tokens": sum(r["prompt_tokens"] or 0 for r in records),
+                "completion_tokens": sum(r["completion_tokens"] or 0 for r in records),
+            }
+        return summary
+
+    def _export(self, record):
+        try:
+            if os.path.exists(self.export_path) and os.path.getsize(self.export_path) > EXPORT_MAX_BYTES:
+                os.replace(self.export_path, self.export_path + ".1")
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+def percentile(values, pct):
+    # 선형 보간 백분위수. 값이 없으면 None
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -0,0 +1,15 @@
+# 캐시/설정 파일을 저장할 앱 데이터 경로
+import os
+
+
+def data_dir():
+    path = os.getenv("APP_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".openai_project")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(*parts):
+    # 상위 폴더까지 만들어 두고 경로를 돌려준다
+    path = os.path.join(data_dir(), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,184 @@
+# 같은 입력의 응답을 재사용하는 2단 캐시 (메모리 LRU -> SQLite)
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from services.paths import data_path
+from services.streaming import stream_chat_text
+from services.transport import call
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+MEMORY_ENTRIES = 256
+DISK_MAX_ENTRIES = 5000
+# 창의적인 답변이 필요한 기능은 기본으로 캐시하지 않는다
+DEFAULT_DISABLED_FEATURES = ("rudebot",)
+
+
+class ResponseCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=None, memory_entries=MEMORY_ENTRIES,
+                 max_entries=DISK_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.path = path or data_path("response_cache.sqlite")
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        disabled = os.getenv("RESPONSE_CACHE_DISABLED")
+        if disabled is None:
+            self.disabled_features = set(DEFAULT_DISABLED_FEATURES)
+        else:
+            self.disabled_features = {name.strip() for name in disabled.split(",") if name.strip()}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                created REAL,
+                accessed REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed);
+        """)
+
+    @staticmethod
+    def key(model, messages, **params):
+        raw = json.dumps([model, messages, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def enabled(self, feature):
+        return feature not in self.disabled_features
+
+    def set_enabled(self, feature, enabled):
+        if enabled:
+            self.disabled_features.discard(feature)
+        else:
+            self.disabled_features.add(feature)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                # 만료된 항목과 한도를 넘는 오래된 항목을 정리한다
+                self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM responses")
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+def cached_chat_lookup(feature, **request):
+    # 요청은 보내지 않고 캐시만 확인한다. 캐시를 끈 기능이거나 없으면 None
+    cache = ResponseCache.instance()
+    if not cache.enabled(feature):
+        return None
+    return cache.get(_request_key(cache, request))
+
+
+def cached_chat_text(client, feature, on_delta=None, lookup=True, **request):
+    # 캐시에 있으면 바로 돌려주고(스트리밍이면 한 번에 전달), 없으면 요청 후 저장한다.
+    # 이미 cached_chat_lookup으로 없는 것을 확인했다면 lookup=False로 다시 찾지 않는다
+    cache = ResponseCache.instance()
+    if not cache.enabled(feature):
+        return _chat_text(client, on_delta, feature=feature, **request)
+
+    key = _request_key(cache, request)
+    text = cache.get(key) if lookup else None
+    if text is not None:
+        if on_delta is not None:
+            on_delta(text)
+        return text
+
+    text = _chat_text(client, on_delta, feature=feature, **request)
+    if text:
+        cache.put(key, text)
+    return text
+
+
+def _request_key(cache, request):
+    params = dict(request)
+    model = params.pop("model")
+    messages = params.pop("messages")
+    return cache.key(model, messages, **params)
+
+
+def _chat_text(client, on_delta=None, **request):
+    if on_delta is not None:
+        return stream_chat_text(client, on_delta, **request)
+    completion = call("chat", client.chat.completions.create, **request)
+    return completion.choices[0].message.content
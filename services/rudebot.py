@@ -0,0 +1,32 @@
+# RudeBot 질의 (Qt 없이 사용 가능)
+from services.streaming import stream_response_text
+from services.transport import call
+
+RUDEBOT_MODEL = "ft:gpt-3.5-turbo-0125:personal::CaKAw4RI"
+RUDEBOT_SYSTEM_PROMPT = "You are RudeBot — a sarcastic chatbot."
+EMPTY_ANSWER = "응답이 비어 있습니다."
+
+
+def ask_rudebot(client, question, on_delta=None, stream=True, conversation=None):
+    # conversation(services.conversation.Conversation)이 있으면 이전 대화를 이어서 묻고 턴을 기록한다.
+    # 시스템 프롬프트 -> 요약 -> 이전 턴 -> 새 질문 순서라 앞부분이 매 턴 같게 유지된다
+    context = conversation.context() if conversation is not None else []
+    request = dict(
+        model=RUDEBOT_MODEL,
+        input=[
+            {"role": "system", "content": RUDEBOT_SYSTEM_PROMPT},
+            *context,
+            {"role": "user", "content": question}
+        ]
+    )
+
+    if stream:
+        text = stream_response_text(client, on_delta, feature="rudebot", **request)
+    else:
+        response = call("responses", client.responses.create, feature="rudebot", **request)
+        text = response.output_text if hasattr(response, "output_text") else ""
+    if not text:
+        return EMPTY_ANSWER
+    if conversation is not None:
+        conversation.add_turn(question, text)
+    return text
@@ -0,0 +1,212 @@
+# 모델별 분당 요청 수(RPM)/토큰 수(TPM) 한도를 지키면서 API 호출 순서를 정하는 전역 스케줄러
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import defaultdict
+
+from services.cancel import Cancelled, current
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+
+# 사용자가 화면 앞에서 기다리는 기능이 일괄 작업보다 먼저 나간다
+FEATURE_PRIORITIES = {
+    "rudebot": PRIORITY_INTERACTIVE,
+    "poem": PRIORITY_INTERACTIVE,
+    "translate": PRIORITY_NORMAL,
+    "image": PRIORITY_NORMAL,
+    "filesearch": PRIORITY_NORMAL,
+    "audio": PRIORITY_NORMAL,
+    "batch_translate": PRIORITY_BULK,
+    "finetune": PRIORITY_BULK,
+    "rudebot_summary": PRIORITY_BULK,
+}
+
+# (RPM, TPM). 계정 등급에 맞게 RATE_LIMITS="gpt-4=500:10000,whisper-1=50:0" 형식으로 덮어쓴다
+DEFAULT_LIMITS = {
+    "gpt-4": (500, 10000),
+    "gpt-4.1": (500, 30000),
+    "gpt-3.5-turbo": (3500, 200000),
+    "dall-e-3": (7, 0),
+    "whisper-1": (50, 0),
+}
+FALLBACK_LIMITS = (500, 30000)
+
+
+def _limits_from_env():
+    limits = dict(DEFAULT_LIMITS)
+    for item in os.getenv("RATE_LIMITS", "").split(","):
+        if "=" not in item:
+            continue
+        model, values = item.split("=", 1)
+        rpm, _, tpm = values.partition(":")
+        limits[model.strip()] = (int(rpm), int(tpm or 0))
+    return limits
+
+
+class TokenBucket:
+    # 분당 per_minute 만큼 꾸준히 채워지는 버킷. per_minute가 0이면 제한 없음
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        if self.capacity:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        if not self.capacity or amount <= 0:
+            return 0.0
+        self.refill(now)
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 보낸다
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def take(self, amount):
+        if self.capacity:
+            self.tokens -= amount
+
+    def adjust(self, amount):
+        # 예상보다 적게 쓰면 돌려받고, 많이 쓰면 더 뺀다
+        if self.capacity:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self):
+        if self.capacity:
+            self.tokens = min(self.tokens, 0.0)
+
+
+class Ticket:
+    def __init__(self, model, estimate, feature, priority):
+        self.model = model
+        self.estimate = estimate
+        self.feature = feature
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.queue_wait = 0.0
+        self.settled = False
+
+
+class RateLimitScheduler:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # 여러 스레드가 동시에 처음 불러도 하나만 만든다
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, limits=None):
+        self.limits = limits if limits is not None else _limits_from_env()
+        self._cond = threading.Condition()
+        self._buckets = {}
+        self._waiting = []
+        self._seq = itertools.count()
+        # 공정 큐잉: 기능별 가상 종료 시각이 작은 요청부터 보낸다 (같은 우선순위 안에서)
+        self._virtual_time = 0.0
+        self._feature_finish = defaultdict(float)
+
+    def acquire(self, model, estimate, feature="default", priority=None):
+        if priority is None:
+            priority = FEATURE_PRIORITIES.get(feature, PRIORITY_NORMAL)
+        ticket = Ticket(model, estimate, feature, priority)
+        # 기다리는 동안 작업이 취소되면 큐에서 빠져서 뒤의 요청을 막지 않는다
+        token = current()
+        handle = token.add_callback(self._wake) if token is not None else None
+        try:
+            return self._wait_for_turn(ticket, token)
+        finally:
+            if token is not None:
+                token.remove_callback(handle)
+
+    def _wait_for_turn(self, ticket, token):
+        model, estimate, feature = ticket.model, ticket.estimate, ticket.feature
+        with self._cond:
+            start = max(self._virtual_time, self._feature_finish[feature])
+            finish = start + max(1, estimate)
+            self._feature_finish[feature] = finish
+            entry = (ticket.priority, finish, next(self._seq), ticket)
+            heapq.heappush(self._waiting, entry)
+
+            while True:
+                if token is not None and token.cancelled:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    raise Cancelled()
+                if self._is_next(entry):
+                    wait = self._wait_time(model, estimate)
+                    if wait <= 0:
+                        self._waiting.remove(entry)
+                        heapq.heapify(self._waiting)
+                        rpm, tpm = self._bucket(model)
+                        rpm.take(1)
+                        tpm.take(estimate)
+                        self._virtual_time = max(self._virtual_time, start)
+                        ticket.queue_wait = time.monotonic() - ticket.enqueued
+                        self._cond.notify_all()
+                        return ticket
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def settle(self, ticket, actual_tokens):
+        # 응답의 usage로 예상 토큰 수를 보정한다
+        if ticket is None or ticket.settled or actual_tokens is None:
+            return
+        with self._cond:
+            ticket.settled = True
+            _, tpm = self._bucket(ticket.model)
+            tpm.adjust(ticket.estimate - actual_tokens)
+            self._cond.notify_all()
+
+    def rate_limited(self, model):
+        # 서버가 429를 돌려주면 버킷을 비워서 다른 요청도 잠시 기다리게 한다
+        with self._cond:
+            rpm, tpm = self._bucket(model)
+            rpm.drain()
+            tpm.drain()
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._waiting)
+
+    def _is_next(self, entry):
+        # 같은 모델을 기다리는 요청 중 가장 앞선 것만 보낼 수 있다 (다른 모델은 막지 않음)
+        model = entry[3].model
+        return entry == min(e for e in self._waiting if e[3].model == model)
+
+    def _wait_time(self, model, estimate):
+        now = time.monotonic()
+        rpm, tpm = self._bucket(model)
+        return max(rpm.wait_time(1, now), tpm.wait_time(estimate, now))
+
+    def _bucket(self, model):
+        if model not in self._buckets:
+            rpm, tpm = self.limits.get(model) or self._match_limits(model)
+            self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+        return self._buckets[model]
+
+    def _match_limits(self, model):
+        # 파인튜닝 모델(ft:gpt-3.5-turbo-0125:...)은 기반 모델 한도를 따른다
+        base = model[3:] if model.startswith("ft:") else model
+        for name, limits in sorted(self.limits.items(), key=lambda item: -len(item[0])):
+            if base.startswith(name):
+                return limits
+        return FALLBACK_LIMITS
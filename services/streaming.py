@@ -0,0 +1,38 @@
+# 스트리밍 API 공통 헬퍼 (Qt 없이 사용 가능)
+from services.transport import call
+
+
+def stream_chat_text(client, on_delta=None, **kwargs):
+    # chat.completions 스트리밍: 조각이 올 때마다 on_delta 호출, 전체 텍스트 반환
+    stream = call(
+        "chat",
+        client.chat.completions.create,
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            if on_delta is not None:
+                on_delta(delta)
+    return "".join(parts)
+
+
+def stream_response_text(client, on_delta=None, **kwargs):
+    # responses 스트리밍: output_text.delta 이벤트만 모아서 반환
+    stream = call("responses", client.responses.create, stream=True, **kwargs)
+    parts = []
+    for event in stream:
+        if event.type == "response.output_text.delta":
+            parts.append(event.delta)
+            if on_delta is not None:
+                on_delta(event.delta)
+        elif event.type in ("error", "response.failed"):
+            message = getattr(event, "message", None) or "스트리밍 응답 생성에 실패했습니다."
+            raise Exception(message)
+    return "".join(parts)
@@ -0,0 +1,33 @@
+# 토큰 수 계산. tiktoken이 있으면 정확히 세고, 없으면 바이트 길이로 어림한다
+import math
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        # 영어는 대략 4바이트, 한글은 한 글자(3바이트)당 1토큰 안팎
+        return math.ceil(len(text.encode("utf-8")) / 4)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages, model="gpt-3.5-turbo"):
+    # 메시지마다 역할/구분자에 드는 고정 비용을 더한다
+    total = 3
+    for message in messages:
+        total += 4 + count_tokens(str(message.get("content") or ""), model)
+    return total
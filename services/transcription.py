@@ -0,0 +1,151 @@
+# 긴 오디오를 나눠서 동시에 전사하고 다시 이어 붙이는 헬퍼
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from services.audio_prep import export_compact, prepare_audio
+from services.cancel import bind, check
+from services.response_cache import ResponseCache
+from services.transport import call
+
+# whisper-1 업로드 제한(25MB)보다 조금 작게 잡는다
+MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+CHUNK_SECONDS = 10 * 60
+OVERLAP_SECONDS = 5
+SILENCE_SEARCH_SECONDS = 20
+MAX_PARALLEL = 4
+TRANSCRIBE_MODEL = "whisper-1"
+# 전사본 캐시 이름 (RESPONSE_CACHE_DISABLED에 넣으면 끈다)
+TRANSCRIPT_FEATURE = "transcribe"
+
+
+def transcribe_file(client, path, chunked=None, max_workers=MAX_PARALLEL, preprocess=True):
+    # 먼저 모노/16kHz/압축 코덱으로 줄인 파일(캐시)로 바꾸고,
+    # chunked가 None이면 줄어든 파일 크기를 보고 분할 여부를 결정한다
+    if preprocess:
+        path = prepare_audio(path)
+        check()
+    if chunked is None:
+        chunked = os.path.getsize(path) > MAX_UPLOAD_BYTES
+
+    # whisper는 같은 오디오도 매번 조금씩 다르게 전사해서 회의록 map 단계의 캐시가 맞지 않으므로
+    # 전사본을 (줄인) 오디오 내용 해시로 캐시한다
+    cache = ResponseCache.instance()
+    key = None
+    if cache.enabled(TRANSCRIPT_FEATURE):
+        key = cache.key(TRANSCRIBE_MODEL, _file_sha256(path), chunked=chunked)
+        text = cache.get(key)
+        if text is not None:
+            return text
+
+    if not chunked:
+        with open(path, "rb") as audio_file:
+            text = _transcribe(client, audio_file)
+    else:
+        text = transcribe_chunked(client, path, max_workers=max_workers)
+    if key is not None and text:
+        cache.put(key, text)
+    return text
+
+
+def transcribe_chunked(client, path, chunk_seconds=CHUNK_SECONDS,
+                       overlap_seconds=OVERLAP_SECONDS, max_workers=MAX_PARALLEL):
+    # pydub(ffmpeg)은 분할 모드에서만 필요하므로 여기서 불러온다
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    bounds = split_bounds(audio, chunk_seconds * 1000, overlap_seconds * 1000,
+                          SILENCE_SEARCH_SECONDS * 1000)
+
+    def transcribe_chunk(index):
+        start, end = bounds[index]
+        buffer = io.BytesIO()
+        extension = export_compact(audio[start:end], buffer)
+        buffer.name = f"chunk_{index}{extension}"
+        buffer.seek(0)
+        return _transcribe(client, buffer)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        texts = list(executor.map(bind(transcribe_chunk), range(len(bounds))))
+    return stitch_transcripts(texts)
+
+
+def split_bounds(audio, chunk_ms, overlap_ms, search_ms=0):
+    # 고정 길이 창으로 자르되, 끝부분 search_ms 안에 무음이 있으면 그 가운데서 자른다
+    total = len(audio)
+    bounds = []
+    start = 0
+    while start < total:
+        end = min(start + chunk_ms, total)
+        if end < total and search_ms:
+            end = _snap_to_silence(audio, start, end, search_ms)
+        bounds.append((start, end))
+        if end >= total:
+            break
+        start = max(end - overlap_ms, start + 1)
+    return bounds
+
+
+def stitch_transcripts(texts, max_overlap_words=60, min_overlap_words=2):
+    # 겹치는 구간에서 중복 전사된 단어를 제거하면서 순서대로 잇는다
+    words = []
+    for text in texts:
+        new_words = text.split()
+        overlap = _overlap_length(words, new_words, max_overlap_words, min_overlap_words)
+        words.extend(new_words[overlap:])
+    return " ".join(words)
+
+
+def _transcribe(client, audio_file):
+    def create(**options):
+        # 재시도할 때 처음부터 다시 보내도록 파일 위치를 되돌린다
+        audio_file.seek(0)
+        return client.audio.transcriptions.create(
+            file=audio_file,
+            response_format="text",
+            **options
+        )
+
+    transcript = call("audio", create, feature="audio", model=TRANSCRIBE_MODEL)
+    if hasattr(transcript, "text"):
+        return transcript.text
+    return str(transcript)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snap_to_silence(audio, start, end, search_ms):
+    from pydub.silence import detect_silence
+
+    window_start = max(start + 1, end - search_ms)
+    silences = detect_silence(
+        audio[window_start:end],
+        min_silence_len=400,
+        silence_thresh=audio.dBFS - 16
+    )
+    if not silences:
+        return end
+    silence_start, silence_end = silences[-1]
+    return window_start + (silence_start + silence_end) // 2
+
+
+def _normalize(word):
+    return re.sub(r"[^\w]", "", word).lower()
+
+
+def _overlap_length(previous, new_words, max_words, min_words):
+    limit = min(max_words, len(previous), len(new_words))
+    tail = [_normalize(w) for w in previous[-limit:]] if limit else []
+    head = [_normalize(w) for w in new_words[:limit]]
+    for size in range(limit, min_words - 1, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    return 0
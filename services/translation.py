@@ -0,0 +1,116 @@
+# 문단 단위 번역: 바뀐 문단만 새로 번역하고 나머지는 캐시에서 가져와 순서대로 다시 합친다
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cancel import bind
+from services.response_cache import cached_chat_lookup, cached_chat_text
+
+TRANSLATE_MODEL = "gpt-3.5-turbo"
+TRANSLATE_SYSTEM_PROMPT = "Translate English to Korean."
+MAX_PARALLEL = 4
+
+_PARAGRAPH_BREAK_RE = re.compile(r"(\n\s*\n)")
+
+
+def split_segments(text):
+    # 짝수 번째는 문단, 홀수 번째는 문단 사이 공백이라 "".join()으로 원문이 복원된다
+    return _PARAGRAPH_BREAK_RE.split(text)
+
+
+def _segment_request(text):
+    return {
+        "model": TRANSLATE_MODEL,
+        "messages": [
+            {"role": "system", "content": TRANSLATE_SYSTEM_PROMPT},
+            {"role": "user", "content": text}
+        ]
+    }
+
+
+def translate_segment(client, text, on_delta=None, feature="translate", lookup=True):
+    # 문단 내용이 캐시 키가 되므로 바뀌지 않은 문단은 요청 없이 재사용된다
+    return cached_chat_text(client, feature, on_delta, lookup=lookup, **_segment_request(text))
+
+
+class _OrderedEmitter:
+    # 여러 문단을 동시에 번역해도 원문 순서대로 내보낸다.
+    # 지금 차례인 조각의 글자는 바로 보내고, 뒤 조각의 글자는 차례가 올 때까지 모아 둔다
+    def __init__(self, count, on_delta):
+        self._on_delta = on_delta
+        self._buffers = [[] for _ in range(count)]
+        self._finished = [False] * count
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def write(self, index, piece):
+        if not piece or self._on_delta is None:
+            return
+        with self._lock:
+            if index == self._cursor:
+                self._on_delta(piece)
+            else:
+                self._buffers[index].append(piece)
+
+    def finish(self, index):
+        with self._lock:
+            self._finished[index] = True
+            while self._cursor < len(self._finished) and self._finished[self._cursor]:
+                self._cursor += 1
+                if self._cursor < len(self._buffers):
+                    self._flush(self._cursor)
+
+    def _flush(self, index):
+        if self._on_delta is not None:
+            for piece in self._buffers[index]:
+                self._on_delta(piece)
+        self._buffers[index] = []
+
+
+def translate_text(client, text, on_delta=None, max_workers=MAX_PARALLEL):
+    # 캐시에 있는 문단은 먼저 채우고, 없는 문단만 max_workers개까지 동시에 번역한다
+    parts = split_segments(text)
+    emitter = _OrderedEmitter(len(parts), on_delta)
+    result = list(parts)
+    pending = []
+
+    for index, part in enumerate(parts):
+        body = part.strip()
+        if index % 2 == 1 or not body:
+            emitter.write(index, part)
+            emitter.finish(index)
+            continue
+
+        # 문단 앞뒤 공백은 원문 그대로 유지한다
+        leading = part[:len(part) - len(part.lstrip())]
+        trailing = part[len(part.rstrip()):]
+        cached = cached_chat_lookup("translate", **_segment_request(body))
+        if cached is None:
+            pending.append((index, leading, body, trailing))
+            continue
+        result[index] = f"{leading}{cached}{trailing}"
+        emitter.write(index, result[index])
+        emitter.finish(index)
+
+    def translate(item):
+        index, leading, body, trailing = item
+        emitter.write(index, leading)
+        translated = translate_segment(
+            client, body,
+            (lambda piece: emitter.write(index, piece)) if on_delta is not None else None,
+            lookup=False
+        )
+        emitter.write(index, trailing)
+        emitter.finish(index)
+        return index, f"{leading}{translated}{trailing}"
+
+    if len(pending) == 1:
+        translated = [translate(pending[0])]
+    elif pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            translated = list(executor.map(bind(translate), pending))
+    else:
+        translated = []
+    for index, value in translated:
+        result[index] = value
+    return "".join(result)
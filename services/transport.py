@@ -0,0 +1,353 @@
+# 모든 OpenAI 호출이 거쳐 가는 공용 전송 계층: 연결 풀, 작업별 타임아웃, 재시도, 취소
+import contextvars
+import email.utils
+import os
+import socket
+import threading
+import time
+
+import httpcore
+import httpx
+from openai import APIConnectionError, APIStatusError, OpenAI
+
+from services.backoff import backoff_delays
+from services.cancel import Cancelled, check, current, on_cancel
+from services.cancel import sleep as cancel_sleep
+from services.metrics import MetricsRecorder
+from services.scheduler import RateLimitScheduler
+from services.tokens import count_message_tokens, count_tokens
+
+# 작업 종류별 타임아웃(초). 채팅은 짧게, 전사/업로드는 길게 잡는다
+TIMEOUTS = {
+    "api": 30,
+    "poll": 15,
+    "chat": 60,
+    "responses": 90,
+    "image": 120,
+    "download": 60,
+    "upload": 300,
+    "audio": 600,
+}
+CONNECT_TIMEOUT = 10
+MAX_RETRIES = 4
+# 재시도 대기 중 Retry-After가 이보다 길면 기다리지 않고 실패로 돌린다
+MAX_RETRY_AFTER = 60
+RETRYABLE_STATUS = (408, 409, 429)
+# 응답 길이를 모를 때 예약해 둘 출력 토큰 수 (실제 usage로 나중에 보정된다)
+DEFAULT_COMPLETION_ESTIMATE = 512
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+_lock = threading.Lock()
+_client = None
+_session = None
+# 지금 이 스레드에서 보내고 있는 호출의 Span (응답 헤더 훅에서 첫 바이트 시각을 기록한다)
+_current_span = contextvars.ContextVar("transport_span", default=None)
+
+
+def pool_size():
+    # 워커 스레드 수 x 기능별 동시 요청(오디오 분석 4개 등)을 감당할 만큼 잡는다
+    return int(os.getenv("HTTP_POOL_SIZE", 32))
+
+
+def get_client():
+    global _client
+    with _lock:
+        if _client is None:
+            http_client = httpx.Client(
+                transport=CancellableTransport(
+                    limits=httpx.Limits(
+                        max_connections=pool_size(),
+                        max_keepalive_connections=pool_size(),
+                        keepalive_expiry=60
+                    )
+                ),
+                timeout=httpx.Timeout(TIMEOUTS["chat"], connect=CONNECT_TIMEOUT),
+                event_hooks={"response": [_on_response_headers]}
+            )
+            # 재시도는 call()에서 직접 하므로 SDK 자체 재시도는 끈다
+            _client = OpenAI(
+                api_key=os.getenv("API_KEY"),
+                http_client=http_client,
+                max_retries=0
+            )
+        return _client
+
+
+def _on_response_headers(response):
+    # httpx는 본문을 읽기 전에 응답 훅을 부르므로 여기가 실제 첫 바이트(헤더 도착) 시각이다
+    span = _current_span.get()
+    if span is not None:
+        span.mark_first_byte()
+
+
+def get_session():
+    # 이미지 등 OpenAI SDK 밖의 HTTP 다운로드용 세션 (연결 재사용 + 재시도)
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size(), max_retries=retry)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def download(url):
+    # 조각 단위로 받으면서 취소 여부를 확인한다
+    check()
+    with get_session().get(url, timeout=(CONNECT_TIMEOUT, TIMEOUTS["download"]), stream=True) as response:
+        response.raise_for_status()
+        parts = []
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+            check()
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+class _CancellableStream(httpcore.NetworkStream):
+    # 요청을 보내거나 응답을 기다리는 중에 작업이 취소되면 소켓을 shutdown해서
+    # 막혀 있던 send/recv를 바로 깨운다 (그 연결은 오류로 끝나고 풀에서 버려진다)
+    def __init__(self, stream):
+        self._stream = stream
+
+    def read(self, max_bytes, timeout=None):
+        with on_cancel(self._abort):
+            return self._stream.read(max_bytes, timeout)
+
+    def write(self, buffer, timeout=None):
+        with on_cancel(self._abort):
+            self._stream.write(buffer, timeout)
+
+    def close(self):
+        self._stream.close()
+
+    def start_tls(self, ssl_context, server_hostname=None, timeout=None):
+        return _CancellableStream(self._stream.start_tls(ssl_context, server_hostname, timeout))
+
+    def get_extra_info(self, info):
+        return self._stream.get_extra_info(info)
+
+    def _abort(self):
+        sock = self._stream.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _CancellableBackend(httpcore.NetworkBackend):
+    def __init__(self, backend):
+        self._backend = backend
+
+    def connect_tcp(self, *args, **kwargs):
+        return _CancellableStream(self._backend.connect_tcp(*args, **kwargs))
+
+    def connect_unix_socket(self, *args, **kwargs):
+        return _CancellableStream(self._backend.connect_unix_socket(*args, **kwargs))
+
+    def sleep(self, seconds):
+        self._backend.sleep(seconds)
+
+
+class CancellableTransport(httpx.HTTPTransport):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # httpx는 네트워크 백엔드를 인자로 받지 않으므로 만들어진 연결 풀의 백엔드를 감싼다
+        backend = getattr(self._pool, "_network_backend", None)
+        if backend is not None:
+            self._pool._network_backend = _CancellableBackend(backend)
+
+
+def call(operation, fn, *args, feature=None, priority=None, max_retries=MAX_RETRIES, **kwargs):
+    # fn(*args, timeout=..., **kwargs)를 호출하고 429/5xx/연결 오류는 지수 백오프로 max_retries번까지 재시도한다.
+    # model이 있는 호출은 시도(재시도 포함)마다 스케줄러에서 RPM/TPM 여유를 받은 뒤에 보낸다.
+    # 모든 호출은 대기/첫 바이트/첫 토큰/전체 시간과 토큰 수가 MetricsRecorder에 기록된다.
+    # 현재 작업(services.cancel)이 취소되면 대기/재시도/전송 어느 단계에서든 Cancelled로 끝난다
+    check()
+    kwargs.setdefault("timeout", TIMEOUTS[operation])
+    model = kwargs.get("model")
+    feature = feature or operation
+    scheduler = RateLimitScheduler.instance()
+    metrics = MetricsRecorder.instance()
+
+    with metrics.track(feature, operation, model) as span:
+        reset = _current_span.set(span)
+        try:
+            result, ticket = _call_with_retry(fn, args, kwargs, span, scheduler, feature, priority, max_retries)
+        finally:
+            _current_span.reset(reset)
+        # 헤더 훅을 거치지 않는 호출(다른 HTTP 클라이언트 등)은 응답을 받은 시각으로 대신한다
+        span.mark_first_byte()
+
+        if kwargs.get("stream"):
+            span.deferred = True
+            return TrackedStream(result, span, metrics, scheduler, ticket)
+
+        usage = _usage_of(result)
+        span.set_usage(usage)
+        if ticket is not None:
+            scheduler.settle(ticket, getattr(usage, "total_tokens", None))
+        return result
+
+
+def _call_with_retry(fn, args, kwargs, span, scheduler, feature, priority, max_retries):
+    # 재시도도 새 요청이므로 매번 티켓을 받는다. 429로 버킷이 비워졌으면 재시도도 그만큼 기다리고
+    # RPM/TPM에 다시 계산된다. 성공한 시도의 티켓을 결과와 함께 돌려준다
+    model = kwargs.get("model")
+    estimate = estimate_tokens(kwargs) if model else 0
+    delays = backoff_delays(initial=0.5, factor=2.0, maximum=8.0)
+    while True:
+        ticket = None
+        if model:
+            ticket = scheduler.acquire(model, estimate, feature, priority)
+            span.queue_wait += ticket.queue_wait
+        span.mark_sent()
+        try:
+            return fn(*args, **kwargs), ticket
+        except Exception as e:
+            if _cancelled(e):
+                raise Cancelled() from e
+            if model and _status_code(e) == 429:
+                scheduler.rate_limited(model)
+            if span.retries >= max_retries or not is_retryable(e):
+                raise
+            delay = retry_after(e)
+            if delay is None:
+                delay = next(delays)
+            elif delay > MAX_RETRY_AFTER:
+                raise
+            span.retries += 1
+            cancel_sleep(delay)
+
+
+def _cancelled(error):
+    # 소켓을 끊어서 난 연결 오류도 취소로 본다
+    if isinstance(error, Cancelled):
+        return True
+    token = current()
+    return token is not None and token.cancelled
+
+
+def estimate_tokens(kwargs):
+    model = kwargs.get("model")
+    if "messages" in kwargs:
+        prompt = count_message_tokens(kwargs["messages"], model)
+    elif "input" in kwargs:
+        value = kwargs["input"]
+        if isinstance(value, str):
+            prompt = count_tokens(value, model)
+        else:
+            prompt = count_message_tokens(value, model)
+    else:
+        return 0
+    completion = kwargs.get("max_tokens") or kwargs.get("max_output_tokens") or DEFAULT_COMPLETION_ESTIMATE
+    return prompt + completion
+
+
+def _usage_of(result):
+    usage = getattr(result, "usage", None)
+    if usage is None:
+        usage = getattr(getattr(result, "response", None), "usage", None)
+    return usage
+
+
+def _has_text(item):
+    if getattr(item, "type", None) == "response.output_text.delta":
+        return True
+    choices = getattr(item, "choices", None)
+    return bool(choices) and bool(getattr(choices[0].delta, "content", None))
+
+
+class TrackedStream:
+    # 스트림을 그대로 흘려보내면서 첫 토큰 시각을 기록하고,
+    # 마지막에 오는 usage로 스케줄러 예약량을 보정한다. 취소되면 연결을 닫고 Cancelled를 던진다
+    def __init__(self, stream, span, metrics, scheduler, ticket):
+        self._stream = stream
+        self._span = span
+        self._metrics = metrics
+        self._scheduler = scheduler
+        self._ticket = ticket
+
+    def __iter__(self):
+        try:
+            for item in self._stream:
+                check()
+                if _has_text(item):
+                    self._span.mark_first_token()
+                usage = _usage_of(item)
+                if usage is not None:
+                    self._span.set_usage(usage)
+                    self._scheduler.settle(self._ticket, getattr(usage, "total_tokens", None))
+                yield item
+        except Exception as e:
+            self._close_stream()
+            if _cancelled(e):
+                self._span.error = "Cancelled"
+                raise Cancelled() from e
+            self._span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._metrics.finish(self._span)
+
+    def close(self):
+        self._close_stream()
+        self._metrics.finish(self._span)
+
+    def _close_stream(self):
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+def _status_code(error):
+    return getattr(error, "status_code", None)
+
+
+def is_retryable(error):
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
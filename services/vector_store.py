@@ -0,0 +1,85 @@
+# 파일 검색용 벡터 스토어를 처음 필요할 때 만들고, id를 저장해서 다음 실행에도 재사용한다
+import json
+import os
+import threading
+import time
+
+from openai import APIError, NotFoundError
+
+from services.paths import data_path
+from services.transport import call
+
+STORE_NAME = "file_search_store"
+# 마지막 사용 후 이 기간이 지나면 서버에서 자동으로 만료된다
+STORE_EXPIRES_DAYS = 7
+
+_lock = threading.Lock()
+_verified_store_id = None
+
+
+def get_vector_store_id(client):
+    global _verified_store_id
+    with _lock:
+        # 이번 실행에서 이미 확인한 스토어는 다시 조회하지 않는다
+        if _verified_store_id is not None:
+            return _verified_store_id
+
+        state = _load_state()
+        store_id = state.get("vector_store_id")
+        if store_id and _is_usable(client, store_id):
+            _verified_store_id = store_id
+            return store_id
+
+        store = call(
+            "api",
+            client.vector_stores.create,
+            feature="filesearch",
+            name=STORE_NAME,
+            expires_after={"anchor": "last_active_at", "days": STORE_EXPIRES_DAYS}
+        )
+        _save_state({"vector_store_id": store.id, "created_at": time.time()})
+        _verified_store_id = store.id
+
+        # 이름이 같은 다른 스토어는 같은 API 키를 쓰는 다른 설치본의 것일 수 있으므로
+        # 상태 파일에 기록돼 있던 (만료된) 이전 스토어만 지운다
+        if store_id:
+            delete_store(client, store_id)
+        return store.id
+
+
+def delete_store(client, store_id):
+    # 정리는 실패해도 괜찮다 (만료된 스토어는 서버에서도 결국 지워진다)
+    try:
+        call("api", client.vector_stores.delete, store_id, feature="filesearch")
+        return True
+    except APIError:
+        return False
+
+
+def _is_usable(client, store_id):
+    # 없거나(404) 만료된 스토어만 새로 만든다. 시간 초과/5xx/인증 오류 등은 그대로 올려 보낸다
+    try:
+        store = call("api", client.vector_stores.retrieve, store_id, feature="filesearch")
+    except NotFoundError:
+        return False
+    return store.status != "expired"
+
+
+def _state_path():
+    return data_path("vector_store.json")
+
+
+def _load_state():
+    try:
+        with open(_state_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    path = _state_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
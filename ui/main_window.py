@@ -119,6 +119,8 @@ class Ui_MainWindow(object):
         self.menu_list.addItem(item)
         item = QtWidgets.QListWidgetItem()
         self.menu_list.addItem(item)
+        item = QtWidgets.QListWidgetItem()
+        self.menu_list.addItem(item)
         self.horizontalLayout.addWidget(self.menu_list)
         self.stackedWidget = QtWidgets.QStackedWidget(self.centralwidget)
         self.stackedWidget.setGeometry(QtCore.QRect(160, 50, 631, 511))
@@ -138,9 +140,16 @@ class Ui_MainWindow(object):
         self.poem_topic_input.setText("")
         self.poem_topic_input.setObjectName("poem_topic_input")
         self.verticalLayout_3.addWidget(self.poem_topic_input)
+        self.poem_btn_layout = QtWidgets.QHBoxLayout()
+        self.poem_btn_layout.setObjectName("poem_btn_layout")
         self.poem_generate_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
         self.poem_generate_btn.setObjectName("poem_generate_btn")
-        self.verticalLayout_3.addWidget(self.poem_generate_btn)
+        self.poem_btn_layout.addWidget(self.poem_generate_btn)
+        self.poem_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_2)
+        self.poem_cancel_btn.setEnabled(False)
+        self.poem_cancel_btn.setObjectName("poem_cancel_btn")
+        self.poem_btn_layout.addWidget(self.poem_cancel_btn)
+        self.verticalLayout_3.addLayout(self.poem_btn_layout)
         self.poem_result_view = QtWidgets.QTextBrowser(self.page)
         self.poem_result_view.setGeometry(QtCore.QRect(0, 150, 631, 361))
         self.poem_result_view.setObjectName("poem_result_view")
@@ -159,14 +168,35 @@ class Ui_MainWindow(object):
         self.image_prompt_input = QtWidgets.QLineEdit(self.verticalLayoutWidget_4)
         self.image_prompt_input.setObjectName("image_prompt_input")
         self.verticalLayout_5.addWidget(self.image_prompt_input)
+        self.image_btn_layout = QtWidgets.QHBoxLayout()
+        self.image_btn_layout.setObjectName("image_btn_layout")
         self.image_generate_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
         self.image_generate_btn.setObjectName("image_generate_btn")
-        self.verticalLayout_5.addWidget(self.image_generate_btn)
+        self.image_btn_layout.addWidget(self.image_generate_btn)
+        self.image_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_4)
+        self.image_cancel_btn.setEnabled(False)
+        self.image_cancel_btn.setObjectName("image_cancel_btn")
+        self.image_btn_layout.addWidget(self.image_cancel_btn)
+        self.image_count_label = QtWidgets.QLabel(self.verticalLayoutWidget_4)
+        self.image_count_label.setObjectName("image_count_label")
+        self.image_btn_layout.addWidget(self.image_count_label)
+        self.image_count_spin = QtWidgets.QSpinBox(self.verticalLayoutWidget_4)
+        self.image_count_spin.setMinimum(1)
+        self.image_count_spin.setMaximum(8)
+        self.image_count_spin.setObjectName("image_count_spin")
+        self.image_btn_layout.addWidget(self.image_count_spin)
+        self.verticalLayout_5.addLayout(self.image_btn_layout)
         self.image_display_label = QtWidgets.QLabel(self.page_2)
-        self.image_display_label.setGeometry(QtCore.QRect(0, 150, 639, 361))
+        self.image_display_label.setGeometry(QtCore.QRect(0, 150, 639, 241))
         self.image_display_label.setText("")
         self.image_display_label.setScaledContents(True)
         self.image_display_label.setObjectName("image_display_label")
+        self.image_gallery = QtWidgets.QListWidget(self.page_2)
+        self.image_gallery.setGeometry(QtCore.QRect(0, 395, 631, 116))
+        self.image_gallery.setIconSize(QtCore.QSize(96, 96))
+        self.image_gallery.setFlow(QtWidgets.QListView.LeftToRight)
+        self.image_gallery.setViewMode(QtWidgets.QListView.IconMode)
+        self.image_gallery.setObjectName("image_gallery")
         self.stackedWidget.addWidget(self.page_2)
         self.page_3 = QtWidgets.QWidget()
         self.page_3.setObjectName("page_3")
@@ -179,9 +209,22 @@ class Ui_MainWindow(object):
         self.translate_source_input = QtWidgets.QTextEdit(self.verticalLayoutWidget_3)
         self.translate_source_input.setObjectName("translate_source_input")
         self.verticalLayout_4.addWidget(self.translate_source_input)
+        self.translate_btn_layout = QtWidgets.QHBoxLayout()
+        self.translate_btn_layout.setObjectName("translate_btn_layout")
         self.translate_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
         self.translate_btn.setObjectName("translate_btn")
-        self.verticalLayout_4.addWidget(self.translate_btn)
+        self.translate_btn_layout.addWidget(self.translate_btn)
+        self.translate_file_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.translate_file_btn.setObjectName("translate_file_btn")
+        self.translate_btn_layout.addWidget(self.translate_file_btn)
+        self.translate_folder_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.translate_folder_btn.setObjectName("translate_folder_btn")
+        self.translate_btn_layout.addWidget(self.translate_folder_btn)
+        self.translate_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_3)
+        self.translate_cancel_btn.setEnabled(False)
+        self.translate_cancel_btn.setObjectName("translate_cancel_btn")
+        self.translate_btn_layout.addWidget(self.translate_cancel_btn)
+        self.verticalLayout_4.addLayout(self.translate_btn_layout)
         self.translate_result_view = QtWidgets.QTextEdit(self.page_3)
         self.translate_result_view.setGeometry(QtCore.QRect(0, 150, 631, 361))
         self.translate_result_view.setObjectName("translate_result_view")
@@ -200,9 +243,24 @@ class Ui_MainWindow(object):
         self.audio_source_input = QtWidgets.QLineEdit(self.verticalLayoutWidget_5)
         self.audio_source_input.setObjectName("audio_source_input")
         self.verticalLayout_6.addWidget(self.audio_source_input)
+        self.audio_btn_layout = QtWidgets.QHBoxLayout()
+        self.audio_btn_layout.setObjectName("audio_btn_layout")
+        self.audio_section_combo = QtWidgets.QComboBox(self.verticalLayoutWidget_5)
+        self.audio_section_combo.setObjectName("audio_section_combo")
+        self.audio_section_combo.addItem("")
+        self.audio_section_combo.addItem("")
+        self.audio_section_combo.addItem("")
+        self.audio_section_combo.addItem("")
+        self.audio_section_combo.addItem("")
+        self.audio_btn_layout.addWidget(self.audio_section_combo)
         self.audio_note_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_5)
         self.audio_note_btn.setObjectName("audio_note_btn")
-        self.verticalLayout_6.addWidget(self.audio_note_btn)
+        self.audio_btn_layout.addWidget(self.audio_note_btn)
+        self.audio_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_5)
+        self.audio_cancel_btn.setEnabled(False)
+        self.audio_cancel_btn.setObjectName("audio_cancel_btn")
+        self.audio_btn_layout.addWidget(self.audio_cancel_btn)
+        self.verticalLayout_6.addLayout(self.audio_btn_layout)
         self.audio_status_label = QtWidgets.QLabel(self.verticalLayoutWidget_5)
         self.audio_status_label.setText("")
         self.audio_status_label.setAlignment(QtCore.Qt.AlignCenter)
@@ -226,9 +284,19 @@ class Ui_MainWindow(object):
         self.user_input = QtWidgets.QLineEdit(self.verticalLayoutWidget_6)
         self.user_input.setObjectName("user_input")
         self.verticalLayout_8.addWidget(self.user_input)
+        self.file_local_checkbox = QtWidgets.QCheckBox(self.verticalLayoutWidget_6)
+        self.file_local_checkbox.setObjectName("file_local_checkbox")
+        self.verticalLayout_8.addWidget(self.file_local_checkbox)
+        self.file_btn_layout = QtWidgets.QHBoxLayout()
+        self.file_btn_layout.setObjectName("file_btn_layout")
         self.file_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_6)
         self.file_btn.setObjectName("file_btn")
-        self.verticalLayout_8.addWidget(self.file_btn)
+        self.file_btn_layout.addWidget(self.file_btn)
+        self.file_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_6)
+        self.file_cancel_btn.setEnabled(False)
+        self.file_cancel_btn.setObjectName("file_cancel_btn")
+        self.file_btn_layout.addWidget(self.file_cancel_btn)
+        self.verticalLayout_8.addLayout(self.file_btn_layout)
         self.translate_result_view_2 = QtWidgets.QTextEdit(self.page_5)
         self.translate_result_view_2.setGeometry(QtCore.QRect(0, 300, 631, 361))
         self.translate_result_view_2.setObjectName("translate_result_view_2")
@@ -248,13 +316,41 @@ class Ui_MainWindow(object):
         self.rudebot_input_2.setText("")
         self.rudebot_input_2.setObjectName("rudebot_input_2")
         self.verticalLayout_9.addWidget(self.rudebot_input_2)
+        self.rudebot_btn_layout = QtWidgets.QHBoxLayout()
+        self.rudebot_btn_layout.setObjectName("rudebot_btn_layout")
         self.rudebot_btn_2 = QtWidgets.QPushButton(self.verticalLayoutWidget_7)
         self.rudebot_btn_2.setObjectName("rudebot_btn_2")
-        self.verticalLayout_9.addWidget(self.rudebot_btn_2)
+        self.rudebot_btn_layout.addWidget(self.rudebot_btn_2)
+        self.rudebot_new_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_7)
+        self.rudebot_new_btn.setObjectName("rudebot_new_btn")
+        self.rudebot_btn_layout.addWidget(self.rudebot_new_btn)
+        self.rudebot_cancel_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_7)
+        self.rudebot_cancel_btn.setEnabled(False)
+        self.rudebot_cancel_btn.setObjectName("rudebot_cancel_btn")
+        self.rudebot_btn_layout.addWidget(self.rudebot_cancel_btn)
+        self.verticalLayout_9.addLayout(self.rudebot_btn_layout)
         self.translate_result_view_3 = QtWidgets.QTextEdit(self.page_6)
         self.translate_result_view_3.setGeometry(QtCore.QRect(0, 300, 631, 361))
         self.translate_result_view_3.setObjectName("translate_result_view_3")
         self.stackedWidget.addWidget(self.page_6)
+        self.page_7 = QtWidgets.QWidget()
+        self.page_7.setObjectName("page_7")
+        self.verticalLayoutWidget_8 = QtWidgets.QWidget(self.page_7)
+        self.verticalLayoutWidget_8.setGeometry(QtCore.QRect(0, 0, 631, 511))
+        self.verticalLayoutWidget_8.setObjectName("verticalLayoutWidget_8")
+        self.verticalLayout_10 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_8)
+        self.verticalLayout_10.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_10.setObjectName("verticalLayout_10")
+        self.label_9 = QtWidgets.QLabel(self.verticalLayoutWidget_8)
+        self.label_9.setObjectName("label_9")
+        self.verticalLayout_10.addWidget(self.label_9)
+        self.metrics_view = QtWidgets.QTextBrowser(self.verticalLayoutWidget_8)
+        self.metrics_view.setObjectName("metrics_view")
+        self.verticalLayout_10.addWidget(self.metrics_view)
+        self.metrics_refresh_btn = QtWidgets.QPushButton(self.verticalLayoutWidget_8)
+        self.metrics_refresh_btn.setObjectName("metrics_refresh_btn")
+        self.verticalLayout_10.addWidget(self.metrics_refresh_btn)
+        self.stackedWidget.addWidget(self.page_7)
         self.verticalLayoutWidget = QtWidgets.QWidget(self.centralwidget)
         self.verticalLayoutWidget.setGeometry(QtCore.QRect(0, 0, 801, 51))
         self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
@@ -291,19 +387,39 @@ class Ui_MainWindow(object):
         item.setText(_translate("MainWindow", "file_search"))
         item = self.menu_list.item(5)
         item.setText(_translate("MainWindow", "rudebot"))
+        item = self.menu_list.item(6)
+        item.setText(_translate("MainWindow", "metrics"))
         self.menu_list.setSortingEnabled(__sortingEnabled)
         self.label.setText(_translate("MainWindow", "시 주제를 입력하세요"))
         self.poem_generate_btn.setText(_translate("MainWindow", "시 생성"))
+        self.poem_cancel_btn.setText(_translate("MainWindow", "취소"))
         self.label_2.setText(_translate("MainWindow", "생성할 그림을 설명해주세요"))
         self.image_generate_btn.setText(_translate("MainWindow", "그림 생성"))
+        self.image_cancel_btn.setText(_translate("MainWindow", "취소"))
+        self.image_count_label.setText(_translate("MainWindow", "장 수"))
         self.translate_btn.setText(_translate("MainWindow", "번역 실행"))
+        self.translate_file_btn.setText(_translate("MainWindow", "파일 일괄 번역"))
+        self.translate_folder_btn.setText(_translate("MainWindow", "폴더 일괄 번역"))
+        self.translate_cancel_btn.setText(_translate("MainWindow", "취소"))
         self.label_4.setText(_translate("MainWindow", "오디오 파일의 경로를 입력하세요. "))
         self.audio_source_input.setText(_translate("MainWindow", "오디오 경로를 입력하세요"))
+        self.audio_section_combo.setItemText(0, _translate("MainWindow", "전체 항목"))
+        self.audio_section_combo.setItemText(1, _translate("MainWindow", "요약만 다시"))
+        self.audio_section_combo.setItemText(2, _translate("MainWindow", "핵심 내용만 다시"))
+        self.audio_section_combo.setItemText(3, _translate("MainWindow", "할 일만 다시"))
+        self.audio_section_combo.setItemText(4, _translate("MainWindow", "감정 분석만 다시"))
         self.audio_note_btn.setText(_translate("MainWindow", "오디오 회의 요약 노트 생성"))
+        self.audio_cancel_btn.setText(_translate("MainWindow", "취소"))
         self.label_7.setText(_translate("MainWindow", "분석할 파일 경로를 입력하고, 파일에 관련된 질문을 작성해주세요."))
         self.file_input.setText(_translate("MainWindow", "파일 경로를 입력하세요"))
         self.user_input.setText(_translate("MainWindow", "파일 내에 질문사항을 입력해주세요"))
+        self.file_local_checkbox.setText(_translate("MainWindow", "로컬 검색 사용 (업로드 없이 내 PC에서 검색)"))
         self.file_btn.setText(_translate("MainWindow", "답변 생성"))
+        self.file_cancel_btn.setText(_translate("MainWindow", "취소"))
         self.label_8.setText(_translate("MainWindow", "봇에게 질문을 해주세요!"))
         self.rudebot_btn_2.setText(_translate("MainWindow", "답변 생성"))
+        self.rudebot_new_btn.setText(_translate("MainWindow", "새 대화"))
+        self.rudebot_cancel_btn.setText(_translate("MainWindow", "취소"))
+        self.label_9.setText(_translate("MainWindow", "기능별 API 호출 지연 시간 (초)"))
+        self.metrics_refresh_btn.setText(_translate("MainWindow", "새로고침"))
         self.label_3.setText(_translate("MainWindow", "Open AI Projects"))
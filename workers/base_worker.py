@@ -0,0 +1,45 @@
+import traceback
+from PyQt5.QtCore import QObject, pyqtSignal
+from services.cancel import Cancelled, CancelToken, scope
+
+
+class BaseWorker(QObject):
+    # 모든 워커 공통 시그널: 실패 메시지, 취소됨, 작업 종료(성공/실패/취소 무관)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    done = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        # 어느 스레드에서 불러도 된다. 진행 중인 요청과 대기를 끊어서 work()가 바로 끝나게 한다
+        self.cancel_token.cancel()
+
+    @property
+    def is_cancelled(self):
+        return self.cancel_token.cancelled
+
+    # QObject와 QRunnable을 다중 상속하면 PyQt5에서 QRunnable 쪽이 초기화되지 않으므로
+    # 워커는 QObject로만 두고 WorkerPool이 QRunnable로 감싸서 실행한다
+    def run(self):
+        try:
+            # work() 안의 서비스 호출은 이 토큰을 보고 취소 여부를 확인한다 (services/cancel.py)
+            with scope(self.cancel_token):
+                self.cancel_token.raise_if_cancelled()
+                self.work()
+        except Cancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            # 연결을 끊어서 생긴 오류 등 취소 뒤에 난 오류는 취소로 본다
+            if self.is_cancelled:
+                self.cancelled.emit()
+            else:
+                traceback.print_exc()
+                self.error.emit(str(e))
+        finally:
+            self.done.emit()
+
+    def work(self):
+        raise NotImplementedError
@@ -1,33 +1,104 @@
-from PyQt5.QtCore import QObject, pyqtSignal
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QImage
 from openai import OpenAI
-import traceback
+from services.cancel import Cancelled, bind
+from services.image_cache import ImageCache
+from services.image_gen import generate_image, image_key
+from workers.base_worker import BaseWorker
 
+DEFAULT_MAX_PARALLEL = 3
+THUMBNAIL_SIZE = 96
+PREVIEW_WIDTH = 639
+PREVIEW_HEIGHT = 241
 
-class ImageWorker(QObject):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
 
-    def __init__(self, client: OpenAI, prompt: str):
+def scaled_image(data, width, height):
+    # QImage는 GUI 스레드 밖에서 다뤄도 되므로 디코딩과 축소를 워커에서 끝낸다
+    image = QImage()
+    if not image.loadFromData(data):
+        raise Exception("이미지를 해석할 수 없습니다.")
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class ImageWorker(BaseWorker):
+    finished = pyqtSignal(QImage)
+
+    def __init__(self, client: OpenAI, prompt: str, use_cache: bool = True):
         super().__init__()
         self.client = client
         self.prompt = prompt
+        self.use_cache = use_cache
+
+    def work(self):
+        data = generate_image(self.client, self.prompt, use_cache=self.use_cache)
+
+        # 디코딩도 워커 스레드에서 끝내고 QImage로 넘긴다
+        image = QImage()
+        if not image.loadFromData(data):
+            raise Exception("이미지를 해석할 수 없습니다.")
+
+        self.finished.emit(image)
+
+
+class ImageBatchWorker(BaseWorker):
+    # 프롬프트마다 variants장씩 최대 max_parallel개를 동시에 만들고, 한 장이 끝날 때마다
+    # 썸네일과 미리보기 크기로 줄인 이미지를 보낸다 (원본은 ImageCache에 남는다)
+    item_ready = pyqtSignal(int, str, str, QImage, QImage)
+    item_failed = pyqtSignal(int, str, str)
+    finished = pyqtSignal(int, int)
+
+    def __init__(self, client, prompts, variants=1, max_parallel=None, use_cache=True):
+        super().__init__()
+        self.client = client
+        self.prompts = prompts
+        self.variants = variants
+        if max_parallel is None:
+            max_parallel = int(os.getenv("IMAGE_MAX_PARALLEL", DEFAULT_MAX_PARALLEL))
+        self.max_parallel = max(1, max_parallel)
+        self.use_cache = use_cache
+
+    def work(self):
+        jobs = [(prompt, variant) for prompt in self.prompts for variant in range(self.variants)]
+        succeeded = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, max(1, len(jobs)))) as executor:
+            futures = {
+                executor.submit(bind(self._generate), prompt, variant): (index, prompt)
+                for index, (prompt, variant) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index, prompt = futures[future]
+                try:
+                    key, thumbnail, preview = future.result()
+                except Cancelled:
+                    raise
+                except Exception as e:
+                    failed += 1
+                    self.item_failed.emit(index, prompt, str(e))
+                    continue
+                succeeded += 1
+                self.item_ready.emit(index, prompt, key, thumbnail, preview)
+        self.finished.emit(succeeded, failed)
+
+    def _generate(self, prompt, variant):
+        data = generate_image(self.client, prompt, use_cache=self.use_cache, variant=variant)
+        thumbnail = scaled_image(data, THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        preview = scaled_image(data, PREVIEW_WIDTH, PREVIEW_HEIGHT)
+        return image_key(prompt, variant), thumbnail, preview
+
+
+class ImagePreviewWorker(BaseWorker):
+    # 픽스맵 캐시에서 밀려난 이미지를 디스크 캐시에서 다시 읽어 미리보기 크기로 줄인다
+    finished = pyqtSignal(str, QImage)
+
+    def __init__(self, key):
+        super().__init__()
+        self.key = key
 
-    def run(self):
-        try:
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=self.prompt,
-                size="1024x1024",
-                n=1,
-                response_format="url"
-            )
-
-            url = response.data[0].url
-            if not url:
-                raise Exception("이미지 URL을 가져올 수 없습니다.")
-
-            self.finished.emit(url)
-
-        except Exception as e:
-            traceback.print_exc()
-            self.error.emit(str(e))
\ No newline at end of file
+    def work(self):
+        data = ImageCache.instance().get(self.key)
+        if data is None:
+            raise Exception("이미지가 캐시에서 지워졌습니다.")
+        self.finished.emit(self.key, scaled_image(data, PREVIEW_WIDTH, PREVIEW_HEIGHT))
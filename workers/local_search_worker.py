@@ -0,0 +1,18 @@
+from PyQt5.QtCore import pyqtSignal
+from services.local_search import ask_local
+from workers.base_worker import BaseWorker
+
+
+class LocalSearchWorker(BaseWorker):
+    finished = pyqtSignal(dict, str)
+    progress = pyqtSignal(str)
+
+    def __init__(self, client, file_path, user_question):
+        super().__init__()
+        self.client = client
+        self.file_path = file_path
+        self.user_question = user_question
+
+    def work(self):
+        notes = ask_local(self.client, self.file_path, self.user_question, on_progress=self.progress.emit)
+        self.finished.emit(notes, notes["answer"])
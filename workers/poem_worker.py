@@ -0,0 +1,19 @@
+from PyQt5.QtCore import pyqtSignal
+from pages.poem.first_ChatGPT_API import generate_poem_text
+from workers.base_worker import BaseWorker
+
+
+class PoemWorker(BaseWorker):
+    partial = pyqtSignal(str)
+    finished = pyqtSignal(str)
+
+    def __init__(self, client, topic, stream=True):
+        super().__init__()
+        self.client = client
+        self.topic = topic
+        self.stream = stream
+
+    def work(self):
+        on_delta = self.partial.emit if self.stream else None
+        result = generate_poem_text(self.client, self.topic, on_delta=on_delta)
+        self.finished.emit(result)
@@ -0,0 +1,80 @@
+import os
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool
+
+DEFAULT_MAX_THREADS = 4
+DEFAULT_SHUTDOWN_MSECS = 3000
+
+
+class _WorkerRunnable(QRunnable):
+    # 참조는 WorkerPool이 관리하므로 QThreadPool이 객체를 지우지 않게 한다
+    def __init__(self, worker):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.worker = worker
+
+    def run(self):
+        self.worker.run()
+
+
+# 앱 전체에서 공유하는 워커 실행기.
+# 페이지마다 QThread를 만들지 않고 submit()으로 BaseWorker를 넘기면
+# 최대 max_threads 개의 스레드를 재사용해서 실행한다.
+# 동시 실행 수는 WORKER_MAX_THREADS 환경 변수로 조정할 수 있다.
+class WorkerPool(QObject):
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_threads=None):
+        super().__init__()
+        if max_threads is None:
+            max_threads = int(os.getenv("WORKER_MAX_THREADS", DEFAULT_MAX_THREADS))
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max(1, max_threads))
+        self._active = {}
+
+    @property
+    def max_threads(self):
+        return self._pool.maxThreadCount()
+
+    def set_max_threads(self, count):
+        self._pool.setMaxThreadCount(max(1, count))
+
+    def submit(self, worker):
+        # 실행이 끝날 때까지 파이썬 참조를 잡아둔다
+        runnable = _WorkerRunnable(worker)
+        self._active[worker] = runnable
+        worker.done.connect(self._release)
+        self._pool.start(runnable)
+        return worker
+
+    def cancel(self, worker):
+        worker.cancel()
+        # 아직 스레드를 받지 못한 작업은 큐에서 바로 빼고 끝난 것으로 알린다
+        runnable = self._active.get(worker)
+        if runnable is not None and self._pool.tryTake(runnable):
+            worker.cancelled.emit()
+            worker.done.emit()
+
+    def cancel_all(self):
+        for worker in list(self._active):
+            self.cancel(worker)
+
+    def shutdown(self, msecs=DEFAULT_SHUTDOWN_MSECS):
+        # 앱을 끝낼 때: 모든 작업을 취소하고 스레드가 빠질 때까지 잠깐 기다린다
+        self.cancel_all()
+        return self.wait_for_done(msecs)
+
+    def active_count(self):
+        return len(self._active)
+
+    def wait_for_done(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
+
+    def _release(self):
+        self._active.pop(self.sender(), None)
@@ -1,34 +1,23 @@
-import traceback
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
+from services.conversation import SessionStore
+from services.rudebot import ask_rudebot
+from workers.base_worker import BaseWorker
 
-class RudebotWorker(QObject):
+class RudebotWorker(BaseWorker):
+    partial = pyqtSignal(str)
     finished = pyqtSignal(str)
-    error = pyqtSignal(str)
 
-    def __init__(self, client, question):
+    def __init__(self, client, question, stream=True, session_id=None):
         super().__init__()
         self.client = client
         self.question = question
+        self.stream = stream
+        self.session_id = session_id
 
-    def run(self):
-        try:
-            response = self.client.responses.create(
-                model="ft:gpt-3.5-turbo-0125:personal::CaKAw4RI",
-                input=[
-                    {
-                        "role": "system",
-                        "content": "You are RudeBot — a sarcastic chatbot."
-                    },
-                    {
-                        "role": "user",
-                        "content": self.question
-                    }
-                ]
-            )
-
-            text = response.output_text if hasattr(response, "output_text") else "응답이 비어 있습니다."
-            self.finished.emit(text)
-
-        except Exception as e:
-            traceback.print_exc()
-            self.error.emit(str(e))
\ No newline at end of file
+    def work(self):
+        conversation = None
+        if self.session_id is not None:
+            conversation = SessionStore.instance().get(self.session_id, self.client)
+        text = ask_rudebot(self.client, self.question, self.partial.emit,
+                           stream=self.stream, conversation=conversation)
+        self.finished.emit(text)
@@ -1,27 +1,42 @@
-from PyQt5.QtCore import QObject, QThread, pyqtSignal
-import traceback
+from PyQt5.QtCore import pyqtSignal
+from services.batch_translate import BatchTranslator
+from services.translation import translate_text
+from workers.base_worker import BaseWorker
 
-class TranslateWorker(QObject):
+class TranslateWorker(BaseWorker):
+    partial = pyqtSignal(str)
     finished = pyqtSignal(str)
-    error = pyqtSignal(Exception)
 
-    def __init__(self, client, text):
+    def __init__(self, client, text, stream=True):
         super().__init__()
         self.client = client
         self.text = text
+        self.stream = stream
 
-    def run(self):
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Translate English to Korean."},
-                    {"role": "user", "content": self.text}
-                ]
-            )
-            result = response.choices[0].message.content
-            self.finished.emit(result)
+    def work(self):
+        result = translate_text(
+            self.client,
+            self.text,
+            self.partial.emit if self.stream else None
+        )
+        self.finished.emit(result)
 
-        except Exception as e:
-            traceback.print_exc()
-            self.error.emit(e)
\ No newline at end of file
+
+class BatchTranslateWorker(BaseWorker):
+    progress = pyqtSignal(int, int, str)
+    finished = pyqtSignal(list)
+
+    def __init__(self, client, source_path, output_root=None):
+        super().__init__()
+        self.client = client
+        self.source_path = source_path
+        self.output_root = output_root
+
+    def work(self):
+        translator = BatchTranslator(
+            self.client,
+            self.source_path,
+            output_root=self.output_root,
+            on_progress=self.progress.emit
+        )
+        self.finished.emit(translator.run())